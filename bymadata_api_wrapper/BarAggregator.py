@@ -0,0 +1,337 @@
+"""Incremental OHLCV/VWAP bar aggregation over intraday operations."""
+
+import logging
+
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple
+
+from .components._constants import (
+    INTRADAY_PRICE_FIELD,
+    INTRADAY_SIZE_FIELD,
+    INTRADAY_TIME_FIELD,
+)
+from .components._utils import to_timestamp, parse_interval
+
+logger = logging.getLogger(__name__)
+
+
+class Bar(object):
+    """
+    OHLCV bar for a single security and interval.
+
+    Args:
+        security_id (str): Security ID the bar belongs to.
+        interval (int): Bar length in seconds.
+        start (float): Bar open time as a POSIX timestamp, aligned to the interval.
+    """
+
+    __slots__ = ("security_id", "interval", "start", "open", "high", "low", "close", "volume", "turnover", "trades")
+
+    def __init__(self, security_id: str, interval: int, start: float):
+        self.security_id = security_id
+        self.interval = interval
+        self.start = start
+        self.open: Optional[float] = None
+        self.high: Optional[float] = None
+        self.low: Optional[float] = None
+        self.close: Optional[float] = None
+        self.volume: float = 0
+        self.turnover: float = 0
+        self.trades: int = 0
+
+    @property
+    def end(self) -> float:
+        """Bar close time as a POSIX timestamp."""
+        return self.start + self.interval
+
+    @property
+    def vwap(self) -> Optional[float]:
+        """Volume weighted average price, or None if the bar has no volume."""
+        return self.turnover / self.volume if self.volume else None
+
+    def add(self, price: float, size: float) -> None:
+        """
+        Adds a trade to the bar.
+
+        Args:
+            price (float): Trade price.
+            size (float): Trade size.
+        """
+        if self.open is None:
+            self.open = self.high = self.low = price
+        elif price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+
+        self.close = price
+        self.volume += size
+        self.turnover += price * size
+        self.trades += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the bar as a dictionary.
+
+        Returns:
+            Dict[str, Any]: Bar fields, including end and vwap.
+        """
+        d = {k: getattr(self, k) for k in self.__slots__}
+        d["end"] = self.end
+        d["vwap"] = self.vwap
+        return d
+
+    def __repr__(self):
+        return (f"Bar({self.security_id}, {self.interval}s @ {self.start}: "
+                f"O={self.open} H={self.high} L={self.low} C={self.close} V={self.volume})")
+
+
+class BarAggregator(object):
+    """
+    Maintains OHLCV/VWAP bars for many securities from a stream of trades.
+
+    Every trade updates the open bar of each configured interval in O(1). When a
+    trade falls past the end of an open bar, that bar is completed and passed to
+    every registered callback before a new one is started.
+
+    Results of `intraday_ops` can be fed repeatedly through `update`: only the
+    operations not seen on a previous call are aggregated, so the cost of a poll
+    depends on the new trades and not on the length of the session. This relies on
+    `intraday_ops` returning the session's operations with new ones appended. Lists
+    returned newest first are reversed, and new operations out of time order are
+    sorted before they are aggregated, as `intraday_tape` does.
+
+    Args:
+        intervals (Iterable[Any]): Bar intervals, in seconds or as "1s", "1m", "5m".
+        callbacks (Optional[List[Callable[[Bar], Any]]]): Functions called with each completed bar.
+        price_field (str): Price field of an intraday operation.
+        size_field (str): Size field of an intraday operation.
+        time_field (str): Time field of an intraday operation.
+
+    Raises:
+        ValueError: If an interval is invalid.
+    """
+
+    def __init__(
+        self,
+        intervals: Iterable[Any] = ("1m",),
+        callbacks: Optional[List[Callable[[Bar], Any]]] = None,
+        price_field: str = INTRADAY_PRICE_FIELD,
+        size_field: str = INTRADAY_SIZE_FIELD,
+        time_field: str = INTRADAY_TIME_FIELD
+    ):
+        self._intervals: Tuple[int, ...] = tuple(sorted({parse_interval(i) for i in intervals}))
+
+        if not self._intervals:
+            raise ValueError("At least one bar interval is required.")
+
+        self._callbacks: List[Callable[[Bar], Any]] = list(callbacks or [])
+
+        self._price_field = price_field
+        self._size_field = size_field
+        self._time_field = time_field
+
+        self._bars: Dict[Tuple[str, int], Bar] = {}
+        self._closed: Dict[Tuple[str, int], float] = {}  # Start of the last completed bar
+        self._seen: Dict[str, int] = {}
+
+        self.late_trades: int = 0
+        self.invalid_operations: int = 0
+
+    @property
+    def intervals(self) -> Tuple[int, ...]:
+        """Configured bar intervals, in seconds."""
+        return self._intervals
+
+    def add_callback(self, callback: Callable[[Bar], Any]) -> None:
+        """
+        Registers a function to be called with each completed bar.
+
+        Args:
+            callback (Callable[[Bar], Any]): Function taking a Bar.
+        """
+        self._callbacks.append(callback)
+
+    def _emit(self, bar: Bar) -> None:
+        for callback in self._callbacks:
+            callback(bar)
+
+    def _close(self, key: Tuple[str, int], bar: Bar) -> None:
+        self._closed[key] = bar.start
+        self._emit(bar)
+
+    def _parse(self, op: Dict[str, Any]) -> Tuple[float, float, float]:
+        return (
+            float(op[self._price_field]),
+            float(op[self._size_field]),
+            to_timestamp(op[self._time_field]),
+        )
+
+    def add_trade(self, security_id: str, price: float, size: float, timestamp: float) -> None:
+        """
+        Adds a single trade to the open bars of a security.
+
+        Trades that belong to an already completed bar of an interval are skipped
+        for that interval and counted in `late_trades`.
+
+        Args:
+            security_id (str): Security ID of the trade.
+            price (float): Trade price.
+            size (float): Trade size.
+            timestamp (float): Trade time as a POSIX timestamp.
+        """
+        for interval in self._intervals:
+            key = (security_id, interval)
+            start = timestamp - timestamp % interval
+            bar = self._bars.get(key)
+
+            if bar is None:
+                closed = self._closed.get(key)
+                if closed is not None and start <= closed:
+                    self.late_trades += 1
+                    continue
+                bar = self._bars[key] = Bar(security_id, interval, start)
+            elif start > bar.start:
+                self._close(key, bar)
+                bar = self._bars[key] = Bar(security_id, interval, start)
+            elif start < bar.start:
+                self.late_trades += 1
+                continue
+
+            bar.add(price, size)
+
+    def update(self, security_id: str, operations: List[Dict[str, Any]]) -> int:
+        """
+        Aggregates the operations of a security that were not seen on a previous call.
+
+        `operations` is expected to be the cumulative list returned by `intraday_ops`,
+        oldest first; a list ordered newest first is reversed. If the list is shorter
+        than the one previously seen (for example on a new session) it is aggregated
+        from the start. New operations are sorted by time if they are out of order.
+        Operations that cannot be parsed are skipped and counted in `invalid_operations`.
+
+        Args:
+            security_id (str): Security ID the operations belong to.
+            operations (List[Dict[str, Any]]): Intraday operations for the security.
+
+        Returns:
+            int: Number of new operations aggregated.
+        """
+        if len(operations) > 1:
+            try:
+                first = to_timestamp(operations[0][self._time_field])
+                last = to_timestamp(operations[-1][self._time_field])
+            except (KeyError, TypeError, ValueError):
+                pass
+            else:
+                if first > last:
+                    operations = operations[::-1]
+
+        seen = self._seen.get(security_id, 0)
+
+        if len(operations) < seen:
+            seen = 0
+
+        trades = []
+        for i in range(seen, len(operations)):
+            try:
+                trades.append(self._parse(operations[i]))
+            except (KeyError, TypeError, ValueError):
+                self.invalid_operations += 1
+
+        if any(trades[i][2] > trades[i + 1][2] for i in range(len(trades) - 1)):
+            trades.sort(key=lambda t: t[2])
+
+        # Count the operations as seen before aggregating them, so a failing callback never replays them
+        self._seen[security_id] = len(operations)
+
+        for price, size, timestamp in trades:
+            self.add_trade(security_id, price, size, timestamp)
+
+        return len(trades)
+
+    def poll(
+        self,
+        client: Any,
+        security_ids: Iterable[str],
+        errors: Optional[Dict[str, Exception]] = None
+    ) -> int:
+        """
+        Fetches intraday operations for each security and aggregates the new ones.
+
+        A security whose request fails is logged and skipped, and the others are
+        still aggregated.
+
+        Args:
+            client (BymaDataAPI): Client used to call `intraday_ops`.
+            security_ids (Iterable[str]): Security IDs to poll.
+            errors (Optional[Dict[str, Exception]]): If given, filled with the error of each
+                security that was skipped.
+
+        Returns:
+            int: Number of new operations aggregated.
+        """
+        added = 0
+        for security_id in security_ids:
+            try:
+                operations = client.intraday_ops(security_id=security_id) or []
+            except Exception as e:
+                if errors is not None:
+                    errors[security_id] = e
+                logger.warning("Intraday operations of %s failed: %s", security_id, e)
+                continue
+            added += self.update(security_id, operations)
+        return added
+
+    def flush(self, now: Optional[float] = None) -> List[Bar]:
+        """
+        Completes the open bars that ended at or before `now`.
+
+        Args:
+            now (Optional[float]): POSIX timestamp. If None, every open bar is completed.
+
+        Returns:
+            List[Bar]: The completed bars, which are also passed to the callbacks.
+        """
+        done = [
+            key for key, bar in self._bars.items()
+            if now is None or bar.end <= now
+        ]
+
+        bars = [self._bars.pop(key) for key in done]
+
+        for key, bar in zip(done, bars):
+            self._close(key, bar)
+
+        return bars
+
+    def current(self, security_id: str, interval: Any = "1m") -> Optional[Bar]:
+        """
+        Returns the open bar of a security.
+
+        Args:
+            security_id (str): Security ID.
+            interval (Any): Bar interval, in seconds or as "1s", "1m", "5m".
+
+        Returns:
+            Optional[Bar]: The open bar, or None if there is none.
+        """
+        return self._bars.get((security_id, parse_interval(interval)))
+
+    def reset(self, security_id: Optional[str] = None) -> None:
+        """
+        Discards open bars, completed bar history and seen operation counts without emitting bars.
+
+        Args:
+            security_id (Optional[str]): Security to reset. If None, resets all of them.
+        """
+        if security_id is None:
+            self._bars.clear()
+            self._closed.clear()
+            self._seen.clear()
+            return
+
+        for key in [k for k in self._bars if k[0] == security_id]:
+            del self._bars[key]
+        for key in [k for k in self._closed if k[0] == security_id]:
+            del self._closed[key]
+        self._seen.pop(security_id, None)
@@ -1,11 +1,17 @@
 """Unofficial BYMADATA API wrapper."""
 
-from .components._constants import ENDPOINTS
-from .components._utils import validate_params
+import heapq
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .components._constants import ENDPOINTS, INTRADAY_TIME_FIELD, AUTH_URL, API_BASE_URL
+from .components._utils import validate_params, to_timestamp
 from .components.BymaDataAPIError import BymaDataAPIError
 from ._BaseClient import BymaDataClient
-from typing import Optional, List, Dict, Any
+from .SecurityIdRegistry import registry
+from typing import Optional, List, Dict, Any, Iterable
 
+logger = logging.getLogger(__name__)
 
 class BymaDataAPI(BymaDataClient):
     """
@@ -15,6 +21,8 @@ class BymaDataAPI(BymaDataClient):
         client_id (str): Client ID for BymaData API.
         client_secret (str): Client secret key for BymaData API.
         endpoint (Optional[str]): Endpoint for the API. Must be one of the valid endpoints.
+        auth_url (str): Token URL. Defaults to the BYMADATA authentication server.
+        base_url (str): Data API base URL. Defaults to the BYMADATA API server.
 
     Raises:
         ValueError: If client_id or client_secret is not provided, or if the endpoint is invalid.
@@ -25,12 +33,14 @@ class BymaDataAPI(BymaDataClient):
         self,
         client_id: str,
         client_secret: str,
-        endpoint: Optional[str] = None
+        endpoint: Optional[str] = None,
+        auth_url: str = AUTH_URL,
+        base_url: str = API_BASE_URL
     ):
         if not client_id or not client_secret:
             raise ValueError("Insert valid BymaData client ID and client secret key.")
 
-        super().__init__(client_id, client_secret)
+        super().__init__(client_id, client_secret, auth_url=auth_url, base_url=base_url)
 
         if endpoint in ENDPOINTS:
             self._endpoint = endpoint
@@ -43,7 +53,7 @@ class BymaDataAPI(BymaDataClient):
     @validate_params(service="equity", ignore=["ticker"])
     def equity(
         self,
-        ticker: Optional[str] = None
+        ticker: Optional[str] = None,
         settle_period: str = "0003",
         group: str = "ACCIONES",
         subgroup: Optional[str] = None,
@@ -305,11 +315,17 @@ class BymaDataAPI(BymaDataClient):
 
         Returns:
             List[Dict[str, Any]]: List of intraday operations.
+
+        Raises:
+            ValueError: If neither ticker nor security_id is provided.
         """
         path = "intraday"
 
+        if not security_id and not ticker:
+            raise ValueError("Insert a ticker or a security_id.")
+
         if not security_id:
-            security_id = f'{ticker}-{settle_period}-{operative_form}-{market}-{currency}'
+            security_id = registry.compose(ticker, settle_period, operative_form, market, currency)
 
         params = {"instrument": security_id}
 
@@ -317,6 +333,80 @@ class BymaDataAPI(BymaDataClient):
 
         return res["result"]
 
+    def intraday_tape(
+        self,
+        instruments: Iterable[str],
+        settle_period: str = "0003",
+        currency: str = "ARS",
+        market: str = "CT",
+        operative_form: str = "C",
+        max_workers: int = 8,
+        time_field: str = INTRADAY_TIME_FIELD,
+        errors: Optional[Dict[str, Exception]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches intraday operations for many securities and merges them into one tape.
+
+        Securities are fetched concurrently with at most `max_workers` requests in
+        flight. Each security's operations are expected oldest first, so they are
+        combined with a k-way merge instead of being concatenated and re-sorted; a
+        security whose operations are out of order is sorted before the merge.
+
+        A security whose request fails is left out of the tape and logged, and the
+        others are still merged.
+
+        Args:
+            instruments (Iterable[str]): Security IDs or tickers. Tickers are completed
+                with the remaining arguments.
+            settle_period (str): Settlement period for tickers.
+            currency (str): Currency code for tickers.
+            market (str): Market type for tickers.
+            operative_form (str): Operative form for tickers.
+            max_workers (int): Maximum number of concurrent requests.
+            time_field (str): Time field of an intraday operation.
+            errors (Optional[Dict[str, Exception]]): If given, filled with the error of each
+                security left out of the tape.
+
+        Returns:
+            List[Dict[str, Any]]: Intraday operations of all securities ordered by trade time.
+                Each operation carries its security_id.
+
+        Raises:
+            Exception: The last error, if every security failed.
+        """
+        security_ids = []
+        for instrument in instruments:
+            if instrument in registry or instrument.count("-") >= 4:
+                security_ids.append(instrument)
+            else:
+                security_ids.append(registry.compose(instrument, settle_period, operative_form, market, currency))
+
+        def fetch(security_id: str) -> List[Any]:
+            ops = self.intraday_ops(security_id=security_id) or []
+            stream = []
+            for op in ops:
+                op.setdefault("security_id", security_id)
+                stream.append((to_timestamp(op[time_field]), op))
+            if any(stream[i][0] > stream[i + 1][0] for i in range(len(stream) - 1)):
+                stream.sort(key=lambda x: x[0])
+            return stream
+
+        streams = []
+        failed = {} if errors is None else errors
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(security_ids) or 1))) as pool:
+            futures = {security_id: pool.submit(fetch, security_id) for security_id in security_ids}
+            for security_id, future in futures.items():
+                try:
+                    streams.append(future.result())
+                except Exception as e:
+                    failed[security_id] = e
+                    logger.warning("Intraday operations of %s failed: %s", security_id, e)
+
+        if futures and not streams:
+            raise failed[security_id]
+
+        return [op for _, op in heapq.merge(*streams, key=lambda x: x[0])]
+
 
 ######################################################
 # ENDPOINT SPECIFIC API WRAPPERS
@@ -324,17 +414,17 @@ class BymaDataAPI(BymaDataClient):
 
 class SnapshotAPI(BymaDataAPI):
     """API for Real-Time MARKET DATA Snapshots"""
-    def __init__(self, client_id: str, client_secret: str):
-        super().__init__(client_id, client_secret, "snapshot")
+    def __init__(self, client_id: str, client_secret: str, **kwargs):
+        super().__init__(client_id, client_secret, "snapshot", **kwargs)
 
 
 class DelayedAPI(BymaDataAPI):
     """API for Delayed MARKET DATA Snapshots"""
-    def __init__(self, client_id: str, client_secret: str):
-        super().__init__(client_id, client_secret, "delay20")
+    def __init__(self, client_id: str, client_secret: str, **kwargs):
+        super().__init__(client_id, client_secret, "delay20", **kwargs)
 
 
 class EndOfDayAPI(BymaDataAPI):
     """API for End-of-Day MARKET DATA Snapshots"""
-    def __init__(self, client_id: str, client_secret: str):
-        super().__init__(client_id, client_secret, "eod")
+    def __init__(self, client_id: str, client_secret: str, **kwargs):
+        super().__init__(client_id, client_secret, "eod", **kwargs)
@@ -0,0 +1,342 @@
+"""Local caching HTTP gateway that serves one BYMADATA session to many consumers."""
+
+import gzip
+import json
+import math
+import time
+import hashlib
+import logging
+import requests
+import threading
+
+from collections import OrderedDict
+from inspect import signature
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from typing import Optional, List, Dict, Any, Iterable, NamedTuple, Tuple
+
+from .BymaDataAPI import BymaDataAPI
+from .components._constants import WRAPPER_METHODS
+from .components.BymaDataAPIError import BymaDataAPIError
+
+logger = logging.getLogger(__name__)
+
+# Paths whose ticker argument filters the upstream result instead of being sent upstream
+TICKER_FILTERED_PATHS = ("equity", "fixed_income", "options")
+
+
+class CachedResponse(NamedTuple):
+    """Cached response records, body, its gzip compressed form, ETag and fetch time."""
+    result: Any
+    body: bytes
+    gzipped: bytes
+    etag: str
+    fetched: float
+
+
+class _Entry(object):
+    """
+    Cache slot for a path and upstream parameters. The response is replaced as a whole.
+
+    Ticker filtered responses are kept per ticker in `filtered`, each with the ETag of
+    the response it was filtered from.
+    """
+
+    __slots__ = ("response", "lock", "filtered")
+
+    def __init__(self):
+        self.response: Optional[CachedResponse] = None
+        self.lock = threading.Lock()
+        self.filtered: Dict[str, Tuple[str, CachedResponse]] = {}
+
+
+def _response(result: Any, fetched: float) -> CachedResponse:
+    body = json.dumps({"result": result}, default=str).encode("utf-8")
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+    return CachedResponse(result, body, gzip.compress(body), etag, fetched)
+
+
+class BymaDataGateway(object):
+    """
+    Caches BymaData API responses and serves them over a local HTTP endpoint.
+
+    A single client (one set of credentials and one token) fetches the data; every
+    consumer reads from the cache. Responses are cached per path and upstream
+    parameters, with defaults filled in, for `ttl` seconds; a ticker filter is applied
+    to the cached response, so every ticker shares one upstream request. Concurrent
+    misses for the same key share one upstream request, at most `max_entries` responses
+    are kept (least recently used first out), and paths given in `poll` are refreshed
+    in the background so they are always warm.
+
+    Consumers call `GET /<path>?<params>`, where path is a wrapper method name such as
+    `equity` and params its arguments, e.g. `/equity?currency=USD`. Responses carry an
+    ETag derived from their content, so `If-None-Match` requests for unchanged data are
+    answered with 304 and no body, and are gzip compressed when the consumer accepts it.
+
+    Args:
+        client (BymaDataAPI): Client used for upstream requests.
+        ttl (float): Seconds a cached response is served before it is fetched again. The
+            Cache-Control max-age sent to consumers is `ttl` rounded up to whole seconds.
+        poll (Optional[Iterable[str]]): Requests to refresh in the background, as "path?query".
+        poll_interval (Optional[float]): Seconds between background refreshes. Defaults to `ttl`.
+        max_entries (int): Maximum cached responses.
+
+    Raises:
+        ValueError: If a poll request is invalid or max_entries is not positive.
+    """
+
+    def __init__(
+        self,
+        client: BymaDataAPI,
+        ttl: float = 5.0,
+        poll: Optional[Iterable[str]] = None,
+        poll_interval: Optional[float] = None,
+        max_entries: int = 1024
+    ):
+        if max_entries < 1:
+            raise ValueError("Invalid max_entries. Must be a positive number of responses.")
+
+        self._client = client
+        self._ttl = ttl
+        self._poll_interval = ttl if poll_interval is None else poll_interval
+        self._max_entries = max_entries
+
+        self._cache: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self._poll = []
+        for target in poll or []:
+            path, params = self._parse_request(target)
+            self._poll.append((path, self._upstream(path, params)[0]))
+
+        self._server: Optional[HTTPServer] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @staticmethod
+    def _parse_request(target: str) -> Tuple[str, Dict[str, str]]:
+        parts = urlsplit(target)
+        path = parts.path.strip("/")
+        if path not in WRAPPER_METHODS:
+            raise ValueError(f"Invalid path: {path}. Must be one of: {', '.join(WRAPPER_METHODS)}")
+        return path, dict(parse_qsl(parts.query))
+
+    def _upstream(self, path: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        # Upstream arguments with defaults bound, and the ticker filter of filtered paths
+        bound = signature(getattr(self._client, path)).bind(**params)
+        bound.apply_defaults()
+        arguments = {k: v for k, v in bound.arguments.items() if v is not None}
+        ticker = arguments.pop("ticker", None) if path in TICKER_FILTERED_PATHS else None
+        return arguments, ticker
+
+    def _entry(self, path: str, params: Dict[str, Any]) -> Tuple[Tuple[str, str], _Entry]:
+        key = (path, urlencode(sorted((k, str(v)) for k, v in params.items())))
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                entry = self._cache[key] = _Entry()
+                while len(self._cache) > self._max_entries:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+        return key, entry
+
+    def _refresh(self, path: str, params: Dict[str, Any], entry: _Entry) -> None:
+        response = _response(getattr(self._client, path)(**params), time.time())
+
+        old = entry.response
+        if old is not None and old.etag == response.etag:
+            entry.response = old._replace(fetched=response.fetched)
+        else:
+            entry.response = response
+
+    def _filter(self, entry: _Entry, response: CachedResponse, ticker: str) -> CachedResponse:
+        cached = entry.filtered.get(ticker)
+        if cached is not None and cached[0] == response.etag:
+            return cached[1]._replace(fetched=response.fetched)
+
+        result = [op for op in response.result or [] if (op.get("security_id") or "").startswith(ticker)]
+        filtered = _response(result, response.fetched)
+
+        if len(entry.filtered) >= self._max_entries:
+            entry.filtered.clear()
+        entry.filtered[ticker] = (response.etag, filtered)
+        return filtered
+
+    def get(self, path: str, params: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """
+        Returns the cached response for a request, fetching it if missing or stale.
+
+        Args:
+            path (str): Wrapper method name, e.g. "equity".
+            params (Optional[Dict[str, str]]): Method arguments.
+
+        Returns:
+            CachedResponse: Cached response with records, body, gzipped body and ETag.
+
+        Raises:
+            ValueError: If the path or parameters are invalid.
+            TypeError: If a parameter is not an argument of the path.
+            BymaDataAPIError: If the upstream request fails and nothing is cached.
+            requests.RequestException: If the upstream connection fails and nothing is cached.
+        """
+        if path not in WRAPPER_METHODS:
+            raise ValueError(f"Invalid path: {path}. Must be one of: {', '.join(WRAPPER_METHODS)}")
+
+        params, ticker = self._upstream(path, params or {})
+        key, entry = self._entry(path, params)
+
+        response = entry.response
+        if response is None or time.time() - response.fetched >= self._ttl:
+            with entry.lock:
+                # Another thread may have refreshed it while this one waited
+                response = entry.response
+                if response is None or time.time() - response.fetched >= self._ttl:
+                    try:
+                        self._refresh(path, params, entry)
+                    except (ValueError, TypeError):
+                        with self._cache_lock:
+                            self._cache.pop(key, None)
+                        raise
+                    except (BymaDataAPIError, requests.RequestException):
+                        if response is None:
+                            raise
+                        logger.warning("Serving stale %s %s after upstream error", path, params, exc_info=True)
+                response = entry.response
+
+        if ticker:
+            return self._filter(entry, response, ticker)
+
+        return response
+
+    def _poll_loop(self) -> None:
+        while not self._stop.is_set():
+            for path, params in self._poll:
+                _, entry = self._entry(path, params)
+                try:
+                    with entry.lock:
+                        self._refresh(path, params, entry)
+                except (BymaDataAPIError, ValueError, requests.RequestException):
+                    logger.warning("Polling %s %s failed", path, params, exc_info=True)
+                except Exception:
+                    logger.exception("Polling %s %s failed", path, params)
+            self._stop.wait(self._poll_interval)
+
+    def _handler(self) -> type:
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body and self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _error(self, status: int, msg: str) -> None:
+                body = json.dumps({"error": msg}).encode("utf-8")
+                self._send(status, body, {"Content-Type": "application/json"})
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path = parts.path.strip("/")
+
+                if not path:
+                    body = json.dumps({"paths": WRAPPER_METHODS}).encode("utf-8")
+                    return self._send(200, body, {"Content-Type": "application/json"})
+
+                if path not in WRAPPER_METHODS:
+                    return self._error(404, f"Unknown path: {path}")
+
+                try:
+                    entry = gateway.get(path, dict(parse_qsl(parts.query)))
+                except (ValueError, TypeError) as e:
+                    return self._error(400, str(e))
+                except (BymaDataAPIError, requests.RequestException) as e:
+                    return self._error(502, str(e))
+                except Exception as e:
+                    logger.exception("Serving %s failed", self.path)
+                    return self._error(502, f"Upstream request failed: {type(e).__name__}")
+
+                headers = {
+                    "ETag": entry.etag,
+                    "Cache-Control": "max-age=%d" % math.ceil(gateway._ttl),
+                    "Last-Modified": self.date_time_string(entry.fetched),
+                }
+
+                if entry.etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+                    return self._send(304, headers=headers)
+
+                headers["Content-Type"] = "application/json"
+                headers["Vary"] = "Accept-Encoding"
+
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    headers["Content-Encoding"] = "gzip"
+                    return self._send(200, entry.gzipped, headers)
+
+                return self._send(200, entry.body, headers)
+
+            do_HEAD = do_GET
+
+        return Handler
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        """Host and port the gateway is listening on, or None if it is not running."""
+        return self._server.server_address[:2] if self._server else None
+
+    def start(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """
+        Starts serving and polling on background threads.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on. 0 picks a free port.
+        """
+        class Server(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self._stop.clear()
+        self._server = Server((host, port), self._handler())
+
+        self._threads = [threading.Thread(target=self._server.serve_forever, daemon=True)]
+        if self._poll:
+            self._threads.append(threading.Thread(target=self._poll_loop, daemon=True))
+
+        for t in self._threads:
+            t.start()
+
+        logger.info("BymaData gateway listening on %s:%d", *self.address)
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """
+        Starts the gateway and blocks until interrupted.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on.
+        """
+        self.start(host, port)
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stops serving and polling."""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
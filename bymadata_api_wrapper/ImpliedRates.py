@@ -0,0 +1,272 @@
+"""Implied FX rates (MEP/CCL) and peso rate term structure."""
+
+import re
+import time
+import calendar
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .components._constants import MONTH_CODES
+from .components._utils import to_timestamp, BYMA_TZ
+from .SecurityIdRegistry import SecurityIdRegistry, SecurityId, registry as default_registry
+
+DEFAULT_TENORS = (1, 7, 14, 30, 60, 90, 180, 365)
+
+# Ticker prefix of the dollar futures, e.g. DLR/ENE25
+DOLLAR_FUTURES_PREFIX = "DLR"
+
+_MONTH_RE = re.compile(r"([A-Z]{3})(\d{2})$")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Implied rates require numpy. Install it with: pip install numpy")
+
+
+def _prices(ops: List[Dict[str, Any]], field: str) -> "np.ndarray":
+    """Prices of the records as floats, NaN where missing or not positive."""
+    out = np.array([op.get(field) if op.get(field) is not None else np.nan for op in ops], dtype=float)
+    out[~(out > 0)] = np.nan
+    return out
+
+
+def implied_fx_from(
+    ars: List[Dict[str, Any]],
+    usd: List[Dict[str, Any]],
+    ext: List[Dict[str, Any]],
+    price_field: str = "price",
+    registry: SecurityIdRegistry = default_registry
+) -> Dict[str, Any]:
+    """
+    Computes implied MEP and CCL rates from bond quotes in ARS, USD and EXT.
+
+    Bonds are joined by base ticker and settlement period (AL30, AL30D and AL30C)
+    with a hash join on registry integer codes. Rates are then computed over the
+    joined price arrays: MEP = ARS / USD, CCL = ARS / EXT.
+
+    Args:
+        ars (List[Dict[str, Any]]): Fixed income records in ARS.
+        usd (List[Dict[str, Any]]): Fixed income records in USD (MEP).
+        ext (List[Dict[str, Any]]): Fixed income records in EXT (CCL).
+        price_field (str): Price field of a record.
+        registry (SecurityIdRegistry): Registry used to parse and join security IDs.
+
+    Returns:
+        Dict[str, Any]: Arrays "base_ticker", "settle_period", "ars", "usd", "ext", "mep", "ccl",
+            "canje" (CCL / MEP - 1), one element per ARS bond, plus the medians "mep_median"
+            and "ccl_median".
+    """
+    _require_numpy()
+
+    def index(ops: List[Dict[str, Any]]) -> Tuple[Dict[Tuple[int, int], int], "np.ndarray"]:
+        ids = registry.intern_ops(ops)
+        keys = {}
+        for i, sid in enumerate(ids):
+            if sid >= 0:
+                keys[(registry.component(sid, "base_ticker"), registry.component(sid, "settle_period"))] = i
+        return keys, _prices(ops, price_field)
+
+    ars_keys, ars_px = index(ars)
+    usd_keys, usd_px = index(usd)
+    ext_keys, ext_px = index(ext)
+
+    keys = list(ars_keys)
+    n = len(keys)
+
+    def take(other_keys: Dict[Tuple[int, int], int], px: "np.ndarray") -> "np.ndarray":
+        pos = np.fromiter((other_keys.get(k, -1) for k in keys), dtype=np.int64, count=n)
+        out = np.full(n, np.nan)
+        hit = pos >= 0
+        out[hit] = px[pos[hit]]
+        return out
+
+    a = ars_px[np.fromiter((ars_keys[k] for k in keys), dtype=np.int64, count=n)] if n else np.empty(0)
+    u = take(usd_keys, usd_px)
+    e = take(ext_keys, ext_px)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mep = a / u
+        ccl = a / e
+        canje = ccl / mep - 1
+
+    return {
+        "base_ticker": np.array([registry.value("base_ticker", k[0]) for k in keys], dtype=object),
+        "settle_period": np.array([registry.value("settle_period", k[1]) for k in keys], dtype=object),
+        "ars": a,
+        "usd": u,
+        "ext": e,
+        "mep": mep,
+        "ccl": ccl,
+        "canje": canje,
+        "mep_median": float(np.nanmedian(mep)) if np.isfinite(mep).any() else float("nan"),
+        "ccl_median": float(np.nanmedian(ccl)) if np.isfinite(ccl).any() else float("nan"),
+    }
+
+
+def _futures_ticker(op: Dict[str, Any]) -> str:
+    """Ticker of a futures record without separators, e.g. DLRENE25 for DLR/ENE25."""
+    return (op.get("security_id") or "").split("-")[0].replace("/", "").upper()
+
+
+def _maturity(op: Dict[str, Any], maturity_field: Optional[str]) -> Optional[float]:
+    """Maturity of a futures record, from its field or its ticker month code (end of month, 17:00 BYMA time)."""
+    value = op.get(maturity_field) if maturity_field else None
+    if value is not None:
+        try:
+            return to_timestamp(value)
+        except ValueError:
+            pass
+
+    match = _MONTH_RE.search(_futures_ticker(op))
+    if not match or match.group(1) not in MONTH_CODES:
+        return None
+
+    year, month = 2000 + int(match.group(2)), MONTH_CODES[match.group(1)]
+    day = calendar.monthrange(year, month)[1]
+    return datetime(year, month, day, 17, tzinfo=BYMA_TZ).timestamp()
+
+
+def peso_curve_from(
+    repos: List[Dict[str, Any]],
+    futures: List[Dict[str, Any]],
+    spot: Optional[float] = None,
+    tenors: Sequence[float] = DEFAULT_TENORS,
+    now: Optional[float] = None,
+    price_field: str = "price",
+    repo_tenor_field: Optional[str] = None,
+    futures_maturity_field: Optional[str] = "maturity_date",
+    repo_rate_scale: float = 100.0,
+    futures_prefix: Optional[str] = DOLLAR_FUTURES_PREFIX
+) -> Dict[str, "np.ndarray"]:
+    """
+    Builds a peso rate term structure from cauciones and dollar futures.
+
+    Caución quotes are annual nominal rates. Dollar futures give the implied peso rate
+    (F / spot - 1) * 365 / days, which requires a spot rate; other futures in the
+    payload (e.g. other currencies) are ignored. All points are sorted
+    by tenor and linearly interpolated at `tenors`, flat beyond the first and last points.
+
+    Args:
+        repos (List[Dict[str, Any]]): Collateralized repos (cauciones) records.
+        futures (List[Dict[str, Any]]): FUTMONEDAS futures records.
+        spot (Optional[float]): Spot USD/ARS rate for the futures. If None, futures are not used.
+        tenors (Sequence[float]): Tenors in days to interpolate at.
+        now (Optional[float]): Valuation time as a POSIX timestamp. Defaults to now.
+        price_field (str): Price (or rate) field of a record.
+        repo_tenor_field (Optional[str]): Tenor field of a caución, in days. If None, the
+            settlement period of its security ID is used.
+        futures_maturity_field (Optional[str]): Maturity field of a future. If missing, the
+            month code of the ticker (e.g. DLR/ENE25) is used.
+        repo_rate_scale (float): Divisor turning caución quotes into fractions (100 for percent).
+        futures_prefix (Optional[str]): Ticker prefix of the futures priced against `spot`.
+            If None, every future is used.
+
+    Returns:
+        Dict[str, np.ndarray]: "tenors" and interpolated "rates", plus the curve points
+            "point_tenors", "point_rates" and "point_source" ("repo" or "future").
+    """
+    _require_numpy()
+
+    now = time.time() if now is None else now
+
+    repo_days = np.array([
+        float(op[repo_tenor_field]) if repo_tenor_field and op.get(repo_tenor_field) is not None
+        else _settle_days(op.get("security_id"))
+        for op in repos
+    ], dtype=float)
+    repo_rates = _prices(repos, price_field) / repo_rate_scale
+
+    if futures_prefix:
+        prefix = futures_prefix.replace("/", "").upper()
+        futures = [op for op in futures if _futures_ticker(op).startswith(prefix)]
+
+    if spot and futures:
+        maturities = np.array([_maturity(op, futures_maturity_field) or np.nan for op in futures], dtype=float)
+        fut_days = (maturities - now) / 86400.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fut_rates = (_prices(futures, price_field) / spot - 1) * 365.0 / fut_days
+    else:
+        fut_days = fut_rates = np.empty(0)
+
+    days = np.concatenate([repo_days, fut_days])
+    rates = np.concatenate([repo_rates, fut_rates])
+    source = np.array(["repo"] * len(repo_days) + ["future"] * len(fut_days), dtype=object)
+
+    valid = np.isfinite(days) & np.isfinite(rates) & (days > 0)
+    days, rates, source = days[valid], rates[valid], source[valid]
+
+    order = np.argsort(days, kind="stable")
+    days, rates, source = days[order], rates[order], source[order]
+
+    tenors = np.asarray(tenors, dtype=float)
+    curve = np.interp(tenors, days, rates) if len(days) else np.full(len(tenors), np.nan)
+
+    return {
+        "tenors": tenors,
+        "rates": curve,
+        "point_tenors": days,
+        "point_rates": rates,
+        "point_source": source,
+    }
+
+
+def _settle_days(security_id: Optional[str]) -> float:
+    try:
+        return float(int(SecurityId.parse(security_id).settle_period))
+    except (ValueError, TypeError, AttributeError):
+        return float("nan")
+
+
+def implied_rates(
+    client: Any,
+    settle_period: str = "0003",
+    group: str = "TITULOSPUBLICOS",
+    spot: Optional[float] = None,
+    tenors: Sequence[float] = DEFAULT_TENORS,
+    **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Fetches bonds in ARS/USD/EXT, cauciones and dollar futures concurrently and computes
+    implied MEP/CCL rates and the peso rate term structure.
+
+    Args:
+        client (BymaDataAPI): Client used for the requests.
+        settle_period (str): Settlement period of the bonds.
+        group (str): Fixed income group of the bonds.
+        spot (Optional[float]): Spot USD/ARS rate for the futures implied rates.
+        tenors (Sequence[float]): Tenors in days to interpolate the curve at.
+        **kwargs (Any): Field arguments passed on to `peso_curve_from`.
+
+    Returns:
+        Dict[str, Any]: "fx" with the result of `implied_fx_from`, "curve" with the result
+            of `peso_curve_from`, and "as_of" with the fetch time.
+    """
+    _require_numpy()
+
+    requests = {
+        "ars": lambda: client.fixed_income(settle_period=settle_period, group=group, currency="ARS"),
+        "usd": lambda: client.fixed_income(settle_period=settle_period, group=group, currency="USD"),
+        "ext": lambda: client.fixed_income(settle_period=settle_period, group=group, currency="EXT"),
+        "repos": lambda: client.repos(group="CAUCIONES"),
+        "futures": lambda: client.futures(group="FUTMONEDAS"),
+    }
+
+    as_of = time.time()
+    with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+        futures = {name: pool.submit(fn) for name, fn in requests.items()}
+        data = {name: f.result() or [] for name, f in futures.items()}
+
+    price_field = kwargs.get("price_field", "price")
+
+    return {
+        "as_of": as_of,
+        "fx": implied_fx_from(data["ars"], data["usd"], data["ext"], price_field=price_field),
+        "curve": peso_curve_from(data["repos"], data["futures"], spot=spot, tenors=tenors, now=as_of, **kwargs),
+    }
@@ -0,0 +1,226 @@
+"""Atomic, versioned snapshots of every market data path."""
+
+import time
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Callable, Iterator, Mapping, Tuple
+
+from .components._constants import DATA_PATHS
+
+logger = logging.getLogger(__name__)
+
+# Wrapper method of every snapshot path; intraday is per security and not part of a snapshot
+SNAPSHOT_METHODS = {
+    "equity": "equity",
+    "fixed_income": "fixed_income",
+    "futures": "futures",
+    "options": "options",
+    "collateralized_repos": "repos",
+    "trading_lots": "trading_lots",
+    "loans": "loans",
+    "indices": "indices",
+    "turnover": "turnover",
+}
+
+SNAPSHOT_PATHS = [p for p in DATA_PATHS if p in SNAPSHOT_METHODS]
+
+
+class MarketSnapshot(object):
+    """
+    Immutable view of every data path as of a single time.
+
+    Records of each path are held in a tuple and shared, not copied, between readers;
+    they must be treated as read-only.
+
+    Args:
+        version (int): Snapshot version, increasing with each refresh.
+        as_of (float): POSIX timestamp stamped on every path.
+        data (Dict[str, Tuple[Dict[str, Any], ...]]): Path to records.
+        errors (Optional[Dict[str, str]]): Path to error message for paths whose refresh
+            failed; those paths carry the records of the previous snapshot.
+    """
+
+    __slots__ = ("version", "as_of", "_data", "errors")
+
+    def __init__(
+        self,
+        version: int,
+        as_of: float,
+        data: Dict[str, Tuple[Dict[str, Any], ...]],
+        errors: Optional[Dict[str, str]] = None
+    ):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "as_of", as_of)
+        object.__setattr__(self, "_data", MappingProxyType(dict(data)))
+        object.__setattr__(self, "errors", MappingProxyType(dict(errors or {})))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("MarketSnapshot is immutable")
+
+    def __getitem__(self, path: str) -> Tuple[Dict[str, Any], ...]:
+        return self._data[path]
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def get(self, path: str, default: Any = ()) -> Tuple[Dict[str, Any], ...]:
+        """
+        Returns the records of a path.
+
+        Args:
+            path (str): Data path, e.g. "equity".
+            default (Any): Value returned if the path is not in the snapshot.
+
+        Returns:
+            Tuple[Dict[str, Any], ...]: Records of the path.
+        """
+        return self._data.get(path, default)
+
+    @property
+    def data(self) -> Mapping[str, Tuple[Dict[str, Any], ...]]:
+        """Read-only mapping of path to records."""
+        return self._data
+
+    def __repr__(self):
+        return f"MarketSnapshot(version={self.version}, as_of={self.as_of}, paths={list(self._data)})"
+
+
+class MarketSnapshotRefresher(object):
+    """
+    Fetches every data path concurrently and publishes the result as a MarketSnapshot.
+
+    A refresh builds a new snapshot off to the side and publishes it with a single
+    reference assignment, so readers on any thread get a consistent snapshot from
+    `current` without taking a lock and are never blocked by a refresh in progress.
+
+    Args:
+        client (BymaDataAPI): Client used for the requests.
+        paths (Optional[List[str]]): Paths to fetch. Defaults to every snapshot path.
+        params (Optional[Dict[str, Dict[str, Any]]]): Path to wrapper method arguments.
+        max_workers (Optional[int]): Concurrent requests. Defaults to one per path.
+
+    Raises:
+        ValueError: If a path is invalid.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        paths: Optional[List[str]] = None,
+        params: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_workers: Optional[int] = None
+    ):
+        paths = list(paths or SNAPSHOT_PATHS)
+        invalid = [p for p in paths if p not in SNAPSHOT_METHODS]
+        if invalid:
+            raise ValueError(f"Invalid paths: {', '.join(invalid)}. Must be one of: {', '.join(SNAPSHOT_PATHS)}")
+
+        self._client = client
+        self._paths = paths
+        self._params = params or {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or len(paths))
+
+        self._current = MarketSnapshot(0, 0.0, {})
+        self._refresh_lock = threading.Lock()
+        self._callbacks: List[Callable[[MarketSnapshot], Any]] = []
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> MarketSnapshot:
+        """Latest published snapshot. Version 0 is empty and means no refresh has completed."""
+        return self._current
+
+    def add_callback(self, callback: Callable[[MarketSnapshot], Any]) -> None:
+        """
+        Registers a function to be called with each published snapshot.
+
+        Args:
+            callback (Callable[[MarketSnapshot], Any]): Function taking a MarketSnapshot.
+        """
+        self._callbacks.append(callback)
+
+    def _fetch(self, path: str) -> Tuple[Dict[str, Any], ...]:
+        method = getattr(self._client, SNAPSHOT_METHODS[path])
+        return tuple(method(**self._params.get(path, {})) or ())
+
+    def refresh(self) -> MarketSnapshot:
+        """
+        Fetches every path concurrently and publishes a new snapshot.
+
+        Paths that fail, with any exception, keep the records of the previous snapshot
+        and are listed in the new snapshot's `errors`; the other paths are still published.
+
+        Returns:
+            MarketSnapshot: The published snapshot.
+        """
+        with self._refresh_lock:
+            previous = self._current
+            as_of = time.time()
+
+            futures = {path: self._pool.submit(self._fetch, path) for path in self._paths}
+
+            data = {}
+            errors = {}
+            for path, future in futures.items():
+                try:
+                    data[path] = future.result()
+                except Exception as e:
+                    errors[path] = f"{type(e).__name__}: {e}"
+                    data[path] = previous.get(path)
+                    logger.warning("Refreshing %s failed", path, exc_info=True)
+
+            snapshot = MarketSnapshot(previous.version + 1, as_of, data, errors)
+            self._current = snapshot
+
+        for callback in self._callbacks:
+            callback(snapshot)
+
+        return snapshot
+
+    def _loop(self, interval: float) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Market snapshot refresh failed")
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def start(self, interval: float = 5.0) -> None:
+        """
+        Refreshes on a background thread every `interval` seconds.
+
+        Args:
+            interval (float): Seconds between refresh starts.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops background refreshing."""
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def close(self) -> None:
+        """Stops background refreshing and shuts down the worker threads."""
+        self.stop()
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,375 @@
+"""Polling scheduler that shares one request budget between many jobs."""
+
+import time
+import heapq
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Dict, Any, Callable, Iterable, Set
+
+from .components._constants import TRADING_OPEN, TRADING_CLOSE
+from .components._utils import BYMA_TZ
+
+logger = logging.getLogger(__name__)
+
+# Default of `trading_hours`, which builds a TradingHours per scheduler; None disables it
+_DEFAULT_HOURS = object()
+
+
+class TradingHours(object):
+    """
+    BYMA trading session calendar: weekdays between open and close, excluding holidays.
+
+    Args:
+        open_time (str): Session open, "HH:MM" local time.
+        close_time (str): Session close, "HH:MM" local time.
+        holidays (Optional[Iterable[date]]): Dates without a session.
+    """
+
+    def __init__(self, open_time: str = TRADING_OPEN, close_time: str = TRADING_CLOSE, holidays: Optional[Iterable[date]] = None):
+        self._open = datetime.strptime(open_time, "%H:%M").time()
+        self._close = datetime.strptime(close_time, "%H:%M").time()
+        self._holidays: Set[date] = set(holidays or [])
+
+    def _is_session_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self._holidays
+
+    def is_open(self, timestamp: Optional[float] = None) -> bool:
+        """
+        Returns whether the market is open.
+
+        Args:
+            timestamp (Optional[float]): POSIX timestamp. Defaults to now.
+
+        Returns:
+            bool: True during a trading session.
+        """
+        now = datetime.fromtimestamp(time.time() if timestamp is None else timestamp, BYMA_TZ)
+        return self._is_session_day(now.date()) and self._open <= now.time() < self._close
+
+    def next_open(self, timestamp: Optional[float] = None) -> float:
+        """
+        Returns the start of the current or next trading session.
+
+        Args:
+            timestamp (Optional[float]): POSIX timestamp. Defaults to now.
+
+        Returns:
+            float: POSIX timestamp of the session open, or `timestamp` if the market is open.
+        """
+        ts = time.time() if timestamp is None else timestamp
+        if self.is_open(ts):
+            return ts
+
+        day = datetime.fromtimestamp(ts, BYMA_TZ).date()
+        for _ in range(366):
+            start = datetime.combine(day, self._open).replace(tzinfo=BYMA_TZ).timestamp()
+            if start > ts and self._is_session_day(day):
+                return start
+            day += timedelta(days=1)
+
+        raise ValueError("No trading session within a year.")
+
+
+class Job(object):
+    """
+    Polling job.
+
+    Args:
+        name (str): Job name.
+        fn (Callable[[], Any]): Function performing the request.
+        interval (float): Seconds between runs.
+        priority (int): Lower values run first when several jobs are due.
+        deadline (Optional[float]): Seconds after the due time after which a run is skipped.
+        callback (Optional[Callable[[Any], Any]]): Function called with each result.
+        requests (int): Requests a run consumes from the budget.
+    """
+
+    __slots__ = ("name", "fn", "interval", "priority", "deadline", "callback", "requests",
+                 "due", "running", "removed", "runs", "skipped", "errors", "last_run")
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        interval: float,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        callback: Optional[Callable[[Any], Any]] = None,
+        requests: int = 1
+    ):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.priority = priority
+        self.deadline = deadline
+        self.callback = callback
+        self.requests = requests
+
+        self.due: float = 0
+        self.running = False
+        self.removed = False
+        self.runs = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_run: Optional[float] = None
+
+
+class PollingScheduler(object):
+    """
+    Runs many polling jobs against one client under a single request budget.
+
+    The budget is a token bucket of `rate` requests per second with up to `burst`
+    requests saved. When more jobs are due than the budget allows, they run by
+    priority (lower first) and then by due time; a run that cannot start within
+    its job's deadline is skipped instead of running late. A job never overlaps
+    with itself. Outside trading hours polling pauses until the next session.
+
+    Args:
+        client (Any): Client whose methods the jobs call, e.g. a SnapshotAPI.
+        rate (float): Requests per second.
+        burst (Optional[float]): Maximum saved requests. Defaults to `rate`, and at least 1.
+        max_workers (int): Jobs running at the same time.
+        trading_hours (Optional[TradingHours]): Session calendar. Defaults to the BYMA session
+            without holidays. Pass None to poll around the clock.
+
+    Raises:
+        ValueError: If the rate is not positive or the burst is below one request.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        max_workers: int = 4,
+        trading_hours: Optional[TradingHours] = _DEFAULT_HOURS
+    ):
+        if rate <= 0:
+            raise ValueError("Invalid rate. Must be a positive number of requests per second.")
+
+        self._client = client
+        self._rate = rate
+        self._burst = max(rate, 1) if burst is None else burst
+        if self._burst < 1:
+            raise ValueError("Invalid burst. Must allow at least one request.")
+        self._tokens = self._burst
+        self._refilled = time.monotonic()
+
+        self._trading_hours = TradingHours() if trading_hours is _DEFAULT_HOURS else trading_hours
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        self._jobs: Dict[str, Job] = {}
+        self._queue: List[Any] = []  # (due, seq, job)
+        self._seq = 0
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._paused = False
+
+    def add_job(
+        self,
+        name: str,
+        interval: float,
+        method: Optional[str] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        fn: Optional[Callable[[], Any]] = None,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        callback: Optional[Callable[[Any], Any]] = None,
+        requests: int = 1
+    ) -> Job:
+        """
+        Adds a polling job.
+
+        Args:
+            name (str): Job name.
+            interval (float): Seconds between runs.
+            method (Optional[str]): Client method to call, e.g. "options". Defaults to `name`.
+            kwargs (Optional[Dict[str, Any]]): Arguments for the client method.
+            fn (Optional[Callable[[], Any]]): Function to call instead of a client method.
+            priority (int): Lower values run first when several jobs are due.
+            deadline (Optional[float]): Seconds after the due time after which a run is skipped.
+                Defaults to the interval.
+            callback (Optional[Callable[[Any], Any]]): Function called with each result.
+            requests (int): Requests a run consumes from the budget.
+
+        Returns:
+            Job: The added job.
+
+        Raises:
+            ValueError: If the name is taken, the interval is not positive, or a run needs
+                more requests than the burst allows.
+        """
+        if interval <= 0:
+            raise ValueError("Invalid interval. Must be a positive number of seconds.")
+        if requests > self._burst:
+            raise ValueError(f"Invalid requests. A run cannot need more than the burst of {self._burst} requests.")
+
+        if fn is None:
+            bound = getattr(self._client, method or name)
+            fn = (lambda: bound(**kwargs)) if kwargs else bound
+
+        job = Job(name, fn, interval, priority=priority,
+                  deadline=interval if deadline is None else deadline,
+                  callback=callback, requests=requests)
+
+        with self._lock:
+            if name in self._jobs:
+                raise ValueError(f"Job {name} already exists.")
+            self._jobs[name] = job
+            self._push(job, time.time())
+            self._wakeup.notify()
+
+        return job
+
+    def remove_job(self, name: str) -> None:
+        """
+        Removes a job. A run in progress completes.
+
+        Args:
+            name (str): Job name.
+        """
+        with self._lock:
+            job = self._jobs.pop(name, None)
+            if job is not None:
+                job.removed = True
+
+    def jobs(self) -> List[Job]:
+        """
+        Returns the scheduled jobs.
+
+        Returns:
+            List[Job]: Jobs with their run, skip and error counters.
+        """
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _push(self, job: Job, due: float) -> None:
+        job.due = due
+        self._seq += 1
+        heapq.heappush(self._queue, (due, self._seq, job))
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+
+    def _run(self, job: Job) -> None:
+        try:
+            result = job.fn()
+            if job.callback is not None:
+                job.callback(result)
+        except Exception:
+            job.errors += 1
+            logger.warning("Polling job %s failed", job.name, exc_info=True)
+        finally:
+            with self._lock:
+                job.running = False
+                job.runs += 1
+                if not job.removed:
+                    self._push(job, max(job.due + job.interval, time.time()))
+                    self._wakeup.notify()
+
+    def _dispatch(self) -> Optional[float]:
+        # Starts every job that is due and fits the budget, returns seconds to wait
+        now = time.time()
+
+        if self._trading_hours is not None and not self._trading_hours.is_open(now):
+            self._paused = True
+            return self._trading_hours.next_open(now) - now
+
+        if self._paused:
+            # Start every job afresh at the open instead of skipping overdue runs
+            self._paused = False
+            jobs = [job for _, _, job in self._queue if not job.removed]
+            self._queue.clear()
+            for job in jobs:
+                self._push(job, now)
+
+        ready = []
+        while self._queue and self._queue[0][0] <= now:
+            due, seq, job = heapq.heappop(self._queue)
+            if job.removed:
+                continue
+            if job.deadline is not None and now - due > job.deadline:
+                job.skipped += 1
+                self._push(job, now + job.interval - (now - due) % job.interval)
+                continue
+            heapq.heappush(ready, (job.priority, due, seq, job))
+
+        self._refill()
+
+        while ready:
+            job = ready[0][3]
+            if self._tokens < job.requests:
+                break
+            heapq.heappop(ready)
+            self._tokens -= job.requests
+            job.running = True
+            job.last_run = now
+            self._pool.submit(self._run, job)
+
+        wait = None
+        if ready:
+            # Put waiting jobs back at their due time; they keep their priority
+            for _, due, seq, job in ready:
+                heapq.heappush(self._queue, (due, seq, job))
+            wait = (ready[0][3].requests - self._tokens) / self._rate
+        if self._queue and self._queue[0][0] > now:
+            wait = min(wait or float("inf"), self._queue[0][0] - now)
+
+        return wait
+
+    def _loop(self) -> None:
+        with self._lock:
+            while not self._stop.is_set():
+                wait = self._dispatch()
+                self._wakeup.wait(timeout=wait if wait is None else max(wait, 0.001))
+
+    def start(self) -> None:
+        """Starts the scheduler on a background thread."""
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stops the scheduler.
+
+        Args:
+            wait (bool): Whether to wait for running jobs to finish.
+        """
+        if self._thread is None:
+            return
+
+        with self._lock:
+            self._stop.set()
+            self._wakeup.notify()
+
+        self._thread.join()
+        self._thread = None
+        self._pool.shutdown(wait=wait)
+        self._pool = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns per-job counters.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Job name to runs, skipped runs, errors and last run time.
+        """
+        with self._lock:
+            return {
+                name: {"runs": j.runs, "skipped": j.skipped, "errors": j.errors, "last_run": j.last_run}
+                for name, j in self._jobs.items()
+            }
@@ -0,0 +1,347 @@
+"""Interned, parsed security IDs with small integer handles."""
+
+import sys
+import threading
+from array import array
+from typing import Optional, List, Dict, Any, Iterable, NamedTuple, Tuple
+
+COMPONENTS = ("ticker", "settle_period", "operative_form", "market", "currency")
+
+# Ticker suffixes of the dollar lines of an instrument, e.g. AL30D (MEP) and AL30C (CCL)
+_CURRENCY_SUFFIXES = {"USD": "D", "EXT": "C"}
+
+
+class SecurityId(NamedTuple):
+    """
+    Parsed security ID, e.g. GGAL-0003-C-CT-ARS.
+
+    Args:
+        ticker (str): Ticker symbol.
+        settle_period (str): Settlement period.
+        operative_form (str): Operative form.
+        market (str): Market type.
+        currency (str): Currency code.
+    """
+    ticker: str
+    settle_period: str
+    operative_form: str
+    market: str
+    currency: str
+
+    @classmethod
+    def parse(cls, security_id: str) -> "SecurityId":
+        """
+        Parses a security ID string.
+
+        Args:
+            security_id (str): Security ID, e.g. GGAL-0003-C-CT-ARS.
+
+        Returns:
+            SecurityId: The parsed security ID.
+
+        Raises:
+            ValueError: If the security ID does not have five components.
+        """
+        parts = security_id.rsplit("-", 4)
+        if len(parts) != 5 or not all(parts):
+            raise ValueError(f"Invalid security_id: {security_id}. Must be ticker-settle_period-operative_form-market-currency")
+        return cls(*(sys.intern(p) for p in parts))
+
+    @property
+    def base_ticker(self) -> str:
+        """Ticker without the dollar line suffix (AL30D and AL30C are both AL30)."""
+        suffix = _CURRENCY_SUFFIXES.get(self.currency)
+        if suffix and len(self.ticker) > 1 and self.ticker.endswith(suffix):
+            return self.ticker[:-1]
+        return self.ticker
+
+    def __str__(self):
+        return "-".join(self)
+
+
+class SecurityIdRegistry(object):
+    """
+    Registry that parses each security ID once and hands out small integer IDs.
+
+    Security ID strings and their components are interned, so repeated snapshots
+    share a single instance of each string. Every component value is also coded as
+    an integer, which makes grouping and filtering by component, or joining the same
+    instrument across currencies, integer operations.
+
+    Registration is thread safe; lookups of known security IDs take no lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self._parsed: List[SecurityId] = []
+
+        # Component value <-> code, and the code of every component per security
+        self._codes: Dict[str, Dict[str, int]] = {c: {} for c in COMPONENTS}
+        self._values: Dict[str, List[str]] = {c: [] for c in COMPONENTS}
+        self._columns: Dict[str, array] = {c: array("i") for c in COMPONENTS + ("base_ticker",)}
+        self._codes["base_ticker"] = self._codes["ticker"]
+        self._values["base_ticker"] = self._values["ticker"]
+
+        self._composed: Dict[Tuple[str, ...], str] = {}
+        self._by_key: Dict[Tuple[int, ...], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, security_id: str) -> bool:
+        return security_id in self._ids
+
+    def _code(self, component: str, value: str) -> int:
+        codes = self._codes[component]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._values[component])
+            self._values[component].append(value)
+        return code
+
+    def intern(self, security_id: str) -> int:
+        """
+        Returns the integer ID of a security ID, registering it if needed.
+
+        Args:
+            security_id (str): Security ID, e.g. GGAL-0003-C-CT-ARS.
+
+        Returns:
+            int: Integer ID.
+
+        Raises:
+            ValueError: If the security ID cannot be parsed.
+        """
+        sid = self._ids.get(security_id)
+        if sid is not None:
+            return sid
+
+        parsed = SecurityId.parse(security_id)
+
+        with self._lock:
+            sid = self._ids.get(security_id)
+            if sid is not None:
+                return sid
+
+            sid = len(self._strings)
+            codes = [self._code(c, v) for c, v in zip(COMPONENTS, parsed)]
+            for c, code in zip(COMPONENTS, codes):
+                self._columns[c].append(code)
+            self._columns["base_ticker"].append(self._code("ticker", sys.intern(parsed.base_ticker)))
+
+            self._strings.append(sys.intern(security_id))
+            self._parsed.append(parsed)
+            self._by_key[tuple(codes)] = sid
+            self._ids[self._strings[sid]] = sid
+
+        return sid
+
+    def intern_ops(self, ops: List[Dict[str, Any]], field: str = "security_id") -> List[int]:
+        """
+        Interns the security IDs of snapshot records in place.
+
+        Each record's security ID string is replaced by the registry's instance, so
+        the strings allocated when decoding the response can be released.
+
+        Args:
+            ops (List[Dict[str, Any]]): Snapshot records.
+            field (str): Field holding the security ID.
+
+        Returns:
+            List[int]: Integer ID of every record, -1 where the field is missing or invalid.
+        """
+        out = []
+        for op in ops:
+            security_id = op.get(field)
+            try:
+                sid = self.intern(security_id) if security_id else -1
+            except ValueError:
+                sid = -1
+            if sid >= 0:
+                op[field] = self._strings[sid]
+            out.append(sid)
+        return out
+
+    def compose(
+        self,
+        ticker: str,
+        settle_period: str = "0003",
+        operative_form: str = "C",
+        market: str = "CT",
+        currency: str = "ARS"
+    ) -> str:
+        """
+        Returns the interned security ID string for its components.
+
+        Args:
+            ticker (str): Ticker symbol.
+            settle_period (str): Settlement period.
+            operative_form (str): Operative form.
+            market (str): Market type.
+            currency (str): Currency code.
+
+        Returns:
+            str: Security ID, e.g. GGAL-0003-C-CT-ARS.
+        """
+        key = (ticker, settle_period, operative_form, market, currency)
+        security_id = self._composed.get(key)
+        if security_id is None:
+            security_id = self._strings[self.intern("-".join(key))]
+            self._composed[key] = security_id
+        return security_id
+
+    def id_of(self, security_id: str) -> Optional[int]:
+        """
+        Returns the integer ID of a registered security ID.
+
+        Args:
+            security_id (str): Security ID.
+
+        Returns:
+            Optional[int]: Integer ID, or None if not registered.
+        """
+        return self._ids.get(security_id)
+
+    def string(self, sid: int) -> str:
+        """
+        Returns the security ID string of an integer ID.
+
+        Args:
+            sid (int): Integer ID.
+
+        Returns:
+            str: Interned security ID.
+        """
+        return self._strings[sid]
+
+    def parsed(self, sid: int) -> SecurityId:
+        """
+        Returns the parsed security ID of an integer ID.
+
+        Args:
+            sid (int): Integer ID.
+
+        Returns:
+            SecurityId: Parsed security ID.
+        """
+        return self._parsed[sid]
+
+    def code(self, component: str, value: str) -> Optional[int]:
+        """
+        Returns the integer code of a component value.
+
+        Args:
+            component (str): One of COMPONENTS or "base_ticker".
+            value (str): Component value, e.g. "USD" for currency.
+
+        Returns:
+            Optional[int]: Code, or None if no registered security has that value.
+
+        Raises:
+            KeyError: If the component is invalid.
+        """
+        if component not in self._codes:
+            raise KeyError("Invalid component. Must be one of: %s" % ", ".join(self._columns))
+        return self._codes[component].get(value)
+
+    def value(self, component: str, code: int) -> str:
+        """
+        Returns the component value of an integer code.
+
+        Args:
+            component (str): One of COMPONENTS or "base_ticker".
+            code (int): Component code.
+
+        Returns:
+            str: Component value, e.g. "USD" for a currency code.
+        """
+        return self._values[component][code]
+
+    def component(self, sid: int, component: str) -> int:
+        """
+        Returns the integer code of a security's component.
+
+        Args:
+            sid (int): Integer ID.
+            component (str): One of COMPONENTS or "base_ticker".
+
+        Returns:
+            int: Component code.
+        """
+        return self._columns[component][sid]
+
+    def select(self, sids: Optional[Iterable[int]] = None, **components: str) -> List[int]:
+        """
+        Filters integer IDs by component values.
+
+        Args:
+            sids (Optional[Iterable[int]]): IDs to filter. Defaults to every registered ID.
+            **components (str): Component values to match, e.g. currency="USD", base_ticker="AL30".
+
+        Returns:
+            List[int]: Matching IDs.
+        """
+        if sids is None:
+            sids = range(len(self._strings))
+
+        filters = []
+        for component, value in components.items():
+            code = self.code(component, value)
+            if code is None:
+                return []
+            filters.append((self._columns[component], code))
+
+        return [sid for sid in sids if all(col[sid] == code for col, code in filters)]
+
+    def group_by(self, component: str, sids: Optional[Iterable[int]] = None) -> Dict[int, List[int]]:
+        """
+        Groups integer IDs by the code of a component.
+
+        Args:
+            component (str): One of COMPONENTS or "base_ticker".
+            sids (Optional[Iterable[int]]): IDs to group. Defaults to every registered ID.
+
+        Returns:
+            Dict[int, List[int]]: Component code to IDs.
+        """
+        col = self._columns[component]
+        groups: Dict[int, List[int]] = {}
+        for sid in range(len(self._strings)) if sids is None else sids:
+            groups.setdefault(col[sid], []).append(sid)
+        return groups
+
+    def counterpart(self, sid: int, currency: str) -> Optional[int]:
+        """
+        Returns the same instrument in another currency, e.g. AL30 ARS -> AL30D USD.
+
+        Both the plain ticker and the dollar line ticker (D for USD, C for EXT) are looked up.
+
+        Args:
+            sid (int): Integer ID.
+            currency (str): Target currency code.
+
+        Returns:
+            Optional[int]: Integer ID of the counterpart, or None if not registered.
+        """
+        parsed = self._parsed[sid]
+        base = self._values["ticker"][self._columns["base_ticker"][sid]]
+        currency_code = self.code("currency", currency)
+        if currency_code is None:
+            return None
+
+        tail = tuple(self._columns[c][sid] for c in COMPONENTS[1:4]) + (currency_code,)
+
+        for ticker in (base + _CURRENCY_SUFFIXES.get(currency, ""), base):
+            code = self._codes["ticker"].get(ticker)
+            if code is not None:
+                other = self._by_key.get((code,) + tail)
+                if other is not None and self._parsed[other].base_ticker == parsed.base_ticker:
+                    return other
+        return None
+
+
+# Registry shared by the API clients
+registry = SecurityIdRegistry()
@@ -0,0 +1,417 @@
+"""Fixed-memory intraday time series built from polled snapshots."""
+
+import math
+import time
+from array import array
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+
+from .components._constants import SNAPSHOT_FIELDS
+from .components._utils import to_timestamp
+
+NAN = float("nan")
+
+
+def _to_float(value: Any) -> float:
+    """Value as a float, NaN if missing or not a finite number (e.g. "" or "-")."""
+    if value is None:
+        return NAN
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return NAN
+    return value if math.isfinite(value) else NAN
+
+
+class RingBuffer(object):
+    """
+    Fixed-capacity, array-backed time series for a single security.
+
+    Each column is a preallocated array of doubles, so memory does not grow once
+    the buffer is full: new rows overwrite the oldest ones. Besides the recorded
+    columns, a "spread" column (ask - bid) is derived when both "bid" and "ask"
+    are recorded, and a "return" column (log return of "price") when "price" is.
+
+    Running sums are kept for every column, so the mean and standard deviation
+    over the whole buffer are O(1). Statistics over the last `n` rows are
+    computed over that slice only. Missing and non-numeric values are stored as
+    NaN and ignored by the statistics.
+
+    Args:
+        capacity (int): Maximum number of rows kept.
+        columns (Iterable[str]): Names of the recorded columns.
+
+    Raises:
+        ValueError: If the capacity is not positive.
+    """
+
+    def __init__(self, capacity: int, columns: Iterable[str] = tuple(SNAPSHOT_FIELDS)):
+        if capacity <= 0:
+            raise ValueError("Invalid capacity. Must be a positive integer.")
+
+        self._capacity = capacity
+        self._columns: Tuple[str, ...] = tuple(columns)
+
+        derived = []
+        if "bid" in self._columns and "ask" in self._columns:
+            derived.append("spread")
+        if "price" in self._columns:
+            derived.append("return")
+        self._all_columns: Tuple[str, ...] = self._columns + tuple(derived)
+
+        self._times = array("d", [NAN]) * capacity
+        self._data: Dict[str, array] = {c: array("d", [NAN]) * capacity for c in self._all_columns}
+
+        self._sum: Dict[str, float] = dict.fromkeys(self._all_columns, 0.0)
+        self._sumsq: Dict[str, float] = dict.fromkeys(self._all_columns, 0.0)
+        self._valid: Dict[str, int] = dict.fromkeys(self._all_columns, 0)
+        self._shift: Dict[str, float] = dict.fromkeys(self._all_columns, NAN)  # Reduces cancellation in the sums
+
+        self._head = 0  # Next position to write
+        self._count = 0
+        self._last_price = NAN
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of rows kept."""
+        return self._capacity
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Recorded and derived column names."""
+        return self._all_columns
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, values: Dict[str, Any]) -> None:
+        """
+        Appends a row, overwriting the oldest one if the buffer is full.
+
+        Args:
+            timestamp (float): Row time as a POSIX timestamp.
+            values (Dict[str, Any]): Column values. Missing, None and non-numeric values are stored as NaN.
+        """
+        row = {c: _to_float(values.get(c)) for c in self._columns}
+
+        if "spread" in self._data:
+            row["spread"] = row["ask"] - row["bid"]
+
+        if "return" in self._data:
+            price = row["price"]
+            if price > 0 and self._last_price > 0:
+                row["return"] = math.log(price / self._last_price)
+            else:
+                row["return"] = NAN
+            if not math.isnan(price):
+                self._last_price = price
+
+        pos = self._head
+        full = self._count == self._capacity
+
+        for c, v in row.items():
+            col = self._data[c]
+            if full:
+                self._remove(c, col[pos])
+            col[pos] = v
+            self._add(c, v)
+
+        self._times[pos] = timestamp
+        self._head = (pos + 1) % self._capacity
+
+        if not full:
+            self._count += 1
+        elif self._head == 0:
+            self._resum()  # Bound floating point drift of the running sums once per lap
+
+    def _add(self, column: str, value: float) -> None:
+        if value == value:
+            if self._shift[column] != self._shift[column]:
+                self._shift[column] = value
+            d = value - self._shift[column]
+            self._sum[column] += d
+            self._sumsq[column] += d * d
+            self._valid[column] += 1
+
+    def _remove(self, column: str, value: float) -> None:
+        if value == value:
+            d = value - self._shift[column]
+            self._sum[column] -= d
+            self._sumsq[column] -= d * d
+            self._valid[column] -= 1
+
+    def _resum(self) -> None:
+        for c, col in self._data.items():
+            valid = [v for v in col if v == v]
+            self._shift[c] = valid[-1] if valid else NAN
+            deltas = [v - self._shift[c] for v in valid]
+            self._sum[c] = math.fsum(deltas)
+            self._sumsq[c] = math.fsum(d * d for d in deltas)
+            self._valid[c] = len(valid)
+
+    def _positions(self, n: Optional[int] = None) -> Iterator[int]:
+        n = self._count if n is None else max(0, min(n, self._count))
+        start = self._head - n
+        return (i % self._capacity for i in range(start, self._head))
+
+    def times(self, n: Optional[int] = None) -> List[float]:
+        """
+        Returns row times in chronological order.
+
+        Args:
+            n (Optional[int]): Number of most recent rows. If None, returns all rows.
+
+        Returns:
+            List[float]: POSIX timestamps.
+        """
+        return [self._times[i] for i in self._positions(n)]
+
+    def values(self, column: str, n: Optional[int] = None) -> List[float]:
+        """
+        Returns the values of a column in chronological order.
+
+        Args:
+            column (str): Column name.
+            n (Optional[int]): Number of most recent rows. If None, returns all rows.
+
+        Returns:
+            List[float]: Column values, NaN where missing.
+
+        Raises:
+            KeyError: If the column does not exist.
+        """
+        col = self._column(column)
+        return [col[i] for i in self._positions(n)]
+
+    def last(self, column: str) -> float:
+        """
+        Returns the most recent value of a column.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            float: Last value, NaN if the buffer is empty.
+        """
+        col = self._column(column)
+        return col[self._head - 1] if self._count else NAN
+
+    def _column(self, column: str) -> array:
+        try:
+            return self._data[column]
+        except KeyError:
+            raise KeyError("Invalid column. Must be one of: %s" % ", ".join(self._all_columns))
+
+    def _moments(self, column: str, n: Optional[int]) -> Tuple[int, float, float, float]:
+        # Count, shift, and sums of the values and squares around the shift
+        if n is None or n >= self._count:
+            self._column(column)
+            return self._valid[column], self._shift[column], self._sum[column], self._sumsq[column]
+
+        valid = [v for v in self.values(column, n) if v == v]
+        if not valid:
+            return 0, NAN, 0.0, 0.0
+
+        shift = math.fsum(valid) / len(valid)
+        deltas = [v - shift for v in valid]
+        return len(valid), shift, math.fsum(deltas), math.fsum(d * d for d in deltas)
+
+    def mean(self, column: str, n: Optional[int] = None) -> float:
+        """
+        Moving average of a column.
+
+        Args:
+            column (str): Column name.
+            n (Optional[int]): Window of most recent rows. If None, uses the whole buffer in O(1).
+
+        Returns:
+            float: Mean of the non-missing values, NaN if there are none.
+        """
+        k, shift, s, _ = self._moments(column, n)
+        return shift + s / k if k else NAN
+
+    def std(self, column: str, n: Optional[int] = None) -> float:
+        """
+        Sample standard deviation of a column.
+
+        Args:
+            column (str): Column name.
+            n (Optional[int]): Window of most recent rows. If None, uses the whole buffer in O(1).
+
+        Returns:
+            float: Standard deviation of the non-missing values, NaN if there are less than two.
+        """
+        k, _, s, sq = self._moments(column, n)
+        if k < 2:
+            return NAN
+        return math.sqrt(max(sq - s * s / k, 0.0) / (k - 1))
+
+    def realized_vol(self, n: Optional[int] = None, annualize: Optional[float] = None) -> float:
+        """
+        Realized volatility as the standard deviation of price log returns.
+
+        Args:
+            n (Optional[int]): Window of most recent rows. If None, uses the whole buffer.
+            annualize (Optional[float]): Number of sampling periods per year to scale by.
+
+        Returns:
+            float: Realized volatility, NaN if there are not enough returns.
+        """
+        vol = self.std("return", n)
+        return vol * math.sqrt(annualize) if annualize else vol
+
+    def spread_stats(self, n: Optional[int] = None) -> Dict[str, float]:
+        """
+        Summary statistics of the bid/ask spread.
+
+        Args:
+            n (Optional[int]): Window of most recent rows. If None, uses the whole buffer.
+
+        Returns:
+            Dict[str, float]: Mean, standard deviation, minimum, maximum and last spread.
+        """
+        valid = [v for v in self.values("spread", n) if v == v]
+
+        return {
+            "mean": self.mean("spread", n),
+            "std": self.std("spread", n),
+            "min": min(valid) if valid else NAN,
+            "max": max(valid) if valid else NAN,
+            "last": self.last("spread"),
+        }
+
+    def to_dict(self, n: Optional[int] = None) -> Dict[str, List[float]]:
+        """
+        Returns the buffer as columns in chronological order.
+
+        Args:
+            n (Optional[int]): Number of most recent rows. If None, returns all rows.
+
+        Returns:
+            Dict[str, List[float]]: Column name to values, including "time".
+        """
+        d = {"time": self.times(n)}
+        for c in self._all_columns:
+            d[c] = self.values(c, n)
+        return d
+
+
+class TimeSeriesStore(object):
+    """
+    Per-security ring buffers fed from polled snapshots.
+
+    Args:
+        capacity (int): Rows kept per security.
+        fields (Optional[Dict[str, str]]): Column name to snapshot field mapping. Defaults to SNAPSHOT_FIELDS.
+        time_field (Optional[str]): Snapshot field holding the row time. If None, the poll time is used.
+
+    Raises:
+        ValueError: If the capacity is not positive.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 500,
+        fields: Optional[Dict[str, str]] = None,
+        time_field: Optional[str] = None
+    ):
+        if capacity <= 0:
+            raise ValueError("Invalid capacity. Must be a positive integer.")
+
+        self._capacity = capacity
+        self._fields = dict(fields or SNAPSHOT_FIELDS)
+        self._time_field = time_field
+        self._buffers: Dict[str, RingBuffer] = {}
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __contains__(self, security_id: str) -> bool:
+        return security_id in self._buffers
+
+    def __getitem__(self, security_id: str) -> RingBuffer:
+        return self._buffers[security_id]
+
+    def security_ids(self) -> List[str]:
+        """
+        Returns the securities with a buffer.
+
+        Returns:
+            List[str]: Security IDs.
+        """
+        return list(self._buffers)
+
+    def get(self, security_id: str) -> Optional[RingBuffer]:
+        """
+        Returns the buffer of a security.
+
+        Args:
+            security_id (str): Security ID.
+
+        Returns:
+            Optional[RingBuffer]: The buffer, or None if the security was never recorded.
+        """
+        return self._buffers.get(security_id)
+
+    def append(self, ops: List[Dict[str, Any]], timestamp: Optional[float] = None) -> int:
+        """
+        Appends one row per record of a polled snapshot.
+
+        Args:
+            ops (List[Dict[str, Any]]): Snapshot records, as returned by e.g. `equity()`.
+            timestamp (Optional[float]): Time for records without a valid time field. Defaults to now.
+
+        Returns:
+            int: Number of rows appended.
+        """
+        now = time.time() if timestamp is None else timestamp
+        fields = self._fields.items()
+        n = 0
+
+        for op in ops:
+            security_id = op.get("security_id")
+            if not security_id:
+                continue
+
+            buf = self._buffers.get(security_id)
+            if buf is None:
+                buf = self._buffers[security_id] = RingBuffer(self._capacity, self._fields)
+
+            t = op.get(self._time_field) if self._time_field else None
+            try:
+                t = now if t is None else to_timestamp(t)
+            except (TypeError, ValueError):
+                t = now
+            buf.append(t, {c: op.get(f) for c, f in fields})
+            n += 1
+
+        return n
+
+    def mean(self, column: str, n: Optional[int] = None) -> Dict[str, float]:
+        """
+        Moving average of a column for every security.
+
+        Args:
+            column (str): Column name.
+            n (Optional[int]): Window of most recent rows. If None, uses each whole buffer.
+
+        Returns:
+            Dict[str, float]: Security ID to mean.
+        """
+        return {s: buf.mean(column, n) for s, buf in self._buffers.items()}
+
+    def realized_vol(self, n: Optional[int] = None, annualize: Optional[float] = None) -> Dict[str, float]:
+        """
+        Realized volatility for every security.
+
+        Args:
+            n (Optional[int]): Window of most recent rows. If None, uses each whole buffer.
+            annualize (Optional[float]): Number of sampling periods per year to scale by.
+
+        Returns:
+            Dict[str, float]: Security ID to realized volatility.
+        """
+        return {s: buf.realized_vol(n, annualize) for s, buf in self._buffers.items()}
+
+    def clear(self) -> None:
+        """Discards every buffer."""
+        self._buffers.clear()
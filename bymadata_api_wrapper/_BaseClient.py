@@ -8,6 +8,7 @@ from .components._constants import (
     AUTH_URL,
     API_BASE_URL,
     CONTENT_TYPE,
+    DATA_PATHS,
 )
 
 from .components._utils import (
@@ -15,6 +16,8 @@ from .components._utils import (
     process_response
 )
 
+from .components._hedging import Hedger
+
 
 
 class BymaDataClient(object):
@@ -24,14 +27,20 @@ class BymaDataClient(object):
     Args:
         client_id (str): Client ID for BymaData API.
         client_secret (str): Client secret key for BymaData API.
+        auth_url (str): Token URL. Defaults to the BYMADATA authentication server.
+        base_url (str): Data API base URL. Defaults to the BYMADATA API server.
     """
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, auth_url: str = AUTH_URL, base_url: str = API_BASE_URL):
         super(BymaDataClient, self).__init__()
 
         self._client_id = client_id or None
         self._client_secret = client_secret or None
 
+        self._auth_url = auth_url
+        self._base_url = base_url
+        self._hedger: Optional[Hedger] = None
+
         self._session = requests.Session()
         self._auth_session = requests.Session()
 
@@ -66,7 +75,7 @@ class BymaDataClient(object):
         """Refreshes the API token."""
         current_time = time.time()
 
-        token_response = self._auth_session.post(AUTH_URL, data=self._auth_session.data)
+        token_response = self._auth_session.post(self._auth_url, data=self._auth_session.data)
 
         if token_response:
             r = token_response.json()
@@ -104,10 +113,65 @@ class BymaDataClient(object):
         if not req:
             raise KeyError("Invalid method. Must be one of: %s" % _reqs_.keys())
 
-        r = req(url, params=params or None, headers={"Authorization": f"Bearer {self._token}"})
+        headers = {"Authorization": f"Bearer {self._token}"}
+
+        hedger = self._hedger
+        if hedger is not None and method == "GET":
+            r = hedger.call(url, lambda: req(url, params=params or None, headers=headers))
+        else:
+            r = req(url, params=params or None, headers=headers)
 
         return process_response(r)
 
+    def enable_hedging(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 8
+    ) -> None:
+        """
+        Enables request hedging for GET requests.
+
+        Latencies are tracked per path. Once a path has `min_samples` latencies, a request
+        that has not answered by the `percentile` latency is duplicated and the first
+        response is used. Hedges are capped at `budget` times the number of requests.
+
+        Args:
+            percentile (float): Latency percentile that triggers a hedge.
+            budget (float): Maximum hedges as a fraction of requests, e.g. 0.05 for 5% extra load.
+            min_samples (int): Latency samples per path required before hedging.
+            window (int): Latency samples kept per path.
+            max_workers (int): Worker threads for requests.
+
+        Raises:
+            ValueError: If the percentile or budget is out of range.
+        """
+        # Swap before closing; requests already holding the old hedger run unhedged
+        old, self._hedger = self._hedger, Hedger(
+            percentile=percentile, budget=budget, min_samples=min_samples, window=window, max_workers=max_workers
+        )
+        if old is not None:
+            old.close()
+
+    def disable_hedging(self) -> None:
+        """Disables request hedging."""
+        old, self._hedger = self._hedger, None
+        if old is not None:
+            old.close()
+
+    def hedging_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Returns request hedging counters.
+
+        Returns:
+            Optional[Dict[str, int]]: Requests, hedges sent and hedges that answered first,
+                or None if hedging is disabled.
+        """
+        hedger = self._hedger
+        return hedger.stats() if hedger is not None else None
+
     @ensure_token
     def _data_request(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """
@@ -123,12 +187,10 @@ class BymaDataClient(object):
         Raises:
             ValueError: If an invalid path is provided.
         """
-        valid_paths = {'equity', 'fixed_income', 'futures', 'options', 'collateralized_repos', 'trading_lots', 'loans', 'indices', 'turnover', 'intraday'}
-
-        if path not in valid_paths:
-            raise ValueError('Invalid path. Must be one of: %s' % valid_paths)
+        if path not in DATA_PATHS:
+            raise ValueError('Invalid path. Must be one of: %s' % DATA_PATHS)
 
-        req_url = API_BASE_URL + self._endpoint + "/" + path
+        req_url = self._base_url + self._endpoint + "/" + path
 
         req = self._make_api_request(req_url, params=params)
 
@@ -136,5 +198,7 @@ class BymaDataClient(object):
 
     def _close_sessions(self) -> None:
         """Closes the HTTP sessions."""
+        if self._hedger is not None:
+            self._hedger.close()
         self._session.close()
         self._auth_session.close()
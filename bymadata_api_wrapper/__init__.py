@@ -7,4 +7,37 @@ from .BymaDataAPI import (
 from .components.BymaDataAPIError import (
 	BymaDataAPIError,
 	UnexpectedResponseError
-)
\ No newline at end of file
+)
+
+from .BarAggregator import (
+	Bar,
+	BarAggregator
+)
+
+from .TimeSeriesBuffer import (
+	RingBuffer,
+	TimeSeriesStore
+)
+
+from .SecurityIdRegistry import (
+	SecurityId,
+	SecurityIdRegistry
+)
+
+from .Gateway import BymaDataGateway
+
+from .PollingScheduler import (
+	PollingScheduler,
+	TradingHours
+)
+
+from .ImpliedRates import (
+	implied_rates,
+	implied_fx_from,
+	peso_curve_from
+)
+
+from .MarketSnapshot import (
+	MarketSnapshot,
+	MarketSnapshotRefresher
+)
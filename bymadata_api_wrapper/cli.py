@@ -0,0 +1,378 @@
+"""
+    bymadata_api_wrapper.cli
+
+    Command-line entry point. Bulk exports of API paths over parameter grids,
+    fetched in parallel and streamed to CSV, JSON Lines or Parquet, and the
+    local caching gateway.
+
+    Example:
+        bymadata export -e snapshot -p equity fixed_income \\
+            -g currency=ARS,USD -g settle_period=0000,0003 -f csv -o out.csv
+        bymadata serve -e snapshot --port 8080 --ttl 2 --poll equity "options?currency=USD"
+"""
+import os
+import csv
+import sys
+import json
+import argparse
+import itertools
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from inspect import signature
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple, IO
+
+from .BymaDataAPI import BymaDataAPI
+from .Gateway import BymaDataGateway
+from .components._constants import ENDPOINTS, WRAPPER_METHODS
+from .components.BymaDataAPIError import BymaDataAPIError
+
+FORMATS = ["csv", "jsonl", "parquet"]
+
+
+######################################################
+# WRITERS
+######################################################
+
+def _check_fields(rows: List[Dict[str, Any]], fields: Iterable[str]) -> None:
+    """Raises ValueError if rows have fields outside a fixed schema, instead of dropping them."""
+    known = set(fields)
+    extra = sorted({k for row in rows for k in row if k not in known})
+    if extra:
+        raise ValueError(f"Fields not in the output schema: {', '.join(extra)}")
+
+
+class _CSVWriter(object):
+    """
+    Writes rows as CSV. Columns are fixed by the first batch; a later batch with other
+    fields is refused with a ValueError rather than silently losing them.
+    """
+
+    def __init__(self, out: IO, owned: bool = False):
+        self._out = out
+        self._owned = owned
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._writer is None:
+            fields = list(dict.fromkeys(k for row in rows for k in row))
+            self._writer = csv.DictWriter(self._out, fieldnames=fields)
+            self._writer.writeheader()
+        else:
+            _check_fields(rows, self._writer.fieldnames)
+        self._writer.writerows(rows)
+        self._out.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self._out.close()
+
+
+class _JSONLinesWriter(object):
+    """Writes one JSON object per row."""
+
+    def __init__(self, out: IO, owned: bool = False):
+        self._out = out
+        self._owned = owned
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._out.write(json.dumps(row, default=str))
+            self._out.write("\n")
+        self._out.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self._out.close()
+
+
+class _ParquetWriter(object):
+    """
+    Writes each batch as a Parquet row group. Schema is fixed by the first batch; a later
+    batch that does not fit it is refused with a ValueError.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow. Install it with: pip install pyarrow")
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._writer = None
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        try:
+            if self._writer is None:
+                table = self._pa.Table.from_pylist(rows)
+                self._writer = self._pq.ParquetWriter(self._path, table.schema)
+            else:
+                _check_fields(rows, self._writer.schema.names)
+                table = self._pa.Table.from_pylist(rows, schema=self._writer.schema)
+            self._writer.write_table(table)
+        except self._pa.ArrowException as e:
+            raise ValueError(f"Rows do not fit the Parquet schema: {e}") from e
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _PerPathWriter(object):
+    """Sends the rows of each path to its own writer, created on the path's first rows."""
+
+    def __init__(self, open_writer: Callable[[str], Any]):
+        self._open_writer = open_writer
+        self._writers: Dict[str, Any] = {}
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        path = rows[0]["_path"]
+        writer = self._writers.get(path)
+        if writer is None:
+            writer = self._writers[path] = self._open_writer(path)
+        writer.write(rows)
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+
+
+######################################################
+# EXPORT
+######################################################
+
+def _parse_grid(items: Optional[List[str]]) -> Dict[str, List[Optional[str]]]:
+    """
+    Parses "name=value1,value2" grid arguments.
+
+    Args:
+        items (Optional[List[str]]): Grid arguments.
+
+    Returns:
+        Dict[str, List[Optional[str]]]: Parameter name to values. "None" maps to None.
+
+    Raises:
+        ValueError: If an argument is not in name=values form.
+    """
+    grid = {}
+    for item in items or []:
+        name, sep, values = item.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Invalid grid parameter: {item}. Must be name=value1,value2")
+        grid.setdefault(name.strip(), []).extend(
+            None if v == "None" else v for v in values.split(",")
+        )
+    return grid
+
+
+def _tasks(paths: List[str], grid: Dict[str, List[Optional[str]]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yields (path, params) for every path and combination of the grid parameters it accepts.
+
+    Args:
+        paths (List[str]): Wrapper method names.
+        grid (Dict[str, List[Optional[str]]]): Parameter name to values.
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: Method name and keyword arguments.
+    """
+    for path in paths:
+        accepted = signature(getattr(BymaDataAPI, path)).parameters
+        names = [name for name in grid if name in accepted]
+        for values in itertools.product(*(grid[name] for name in names)):
+            yield path, dict(zip(names, values))
+
+
+def export(
+    client: BymaDataAPI,
+    paths: List[str],
+    grid: Dict[str, List[Optional[str]]],
+    writer: Any,
+    workers: int = 4
+) -> Tuple[int, int]:
+    """
+    Fetches every path/params combination in parallel and streams the rows to a writer.
+
+    At most `workers` requests are in flight and each result is written and released
+    as soon as it arrives, so memory is bounded by the size of a few responses and
+    not by the size of the export.
+
+    Args:
+        client (BymaDataAPI): Client used for the requests.
+        paths (List[str]): Wrapper method names to export.
+        grid (Dict[str, List[Optional[str]]]): Parameter name to values.
+        writer (Any): Object with a `write(rows)` method.
+        workers (int): Number of parallel requests.
+
+    Returns:
+        Tuple[int, int]: Number of rows written and number of failed requests. A request
+            whose call raised, or whose rows the writer refused, counts as failed.
+    """
+    def fetch(path: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rows = getattr(client, path)(**params) or []
+        tag = {"_path": path, "_params": json.dumps(params)}
+        return [dict(row, **tag) for row in rows]
+
+    tasks = _tasks(paths, grid)
+    rows_written = 0
+    failures = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+
+        def submit() -> bool:
+            task = next(tasks, None)
+            if task is None:
+                return False
+            pending[pool.submit(fetch, *task)] = task
+            return True
+
+        while len(pending) < workers and submit():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, params = pending.pop(future)
+                try:
+                    rows = future.result()
+                    writer.write(rows)
+                except Exception as e:
+                    failures += 1
+                    print(f"{path} {params}: {type(e).__name__}: {e}", file=sys.stderr)
+                else:
+                    rows_written += len(rows)
+                submit()
+
+    return rows_written, failures
+
+
+######################################################
+# COMMAND LINE
+######################################################
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bymadata", description="BYMADATA API command-line tools.")
+    commands = parser.add_subparsers(dest="command")
+
+    exp = commands.add_parser("export", help="Export API paths to CSV, JSON Lines or Parquet.")
+    exp.add_argument("-e", "--endpoint", choices=ENDPOINTS, default="snapshot", help="API endpoint.")
+    exp.add_argument("-p", "--paths", nargs="+", choices=WRAPPER_METHODS, required=True, metavar="PATH",
+                     help=f"Paths to export: {', '.join(WRAPPER_METHODS)}.")
+    exp.add_argument("-g", "--grid", action="append", metavar="NAME=V1,V2",
+                     help="Parameter values to combine. May be repeated. Only applied to paths accepting the parameter.")
+    exp.add_argument("-f", "--format", choices=FORMATS, default="csv", help="Output format.")
+    exp.add_argument("-o", "--output", default="-",
+                     help="Output file. Defaults to stdout (not for parquet). CSV and parquet exports of "
+                          "several paths write one file per path, e.g. out.equity.csv for -o out.csv.")
+    exp.add_argument("-w", "--workers", type=int, default=4, help="Number of parallel requests.")
+    _add_credentials(exp)
+
+    srv = commands.add_parser("serve", help="Serve cached API data to local consumers over HTTP.")
+    srv.add_argument("-e", "--endpoint", choices=ENDPOINTS, default="snapshot", help="API endpoint.")
+    srv.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    srv.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    srv.add_argument("--ttl", type=float, default=5.0, help="Seconds a cached response is served before it is fetched again.")
+    srv.add_argument("--poll", nargs="+", metavar="PATH[?QUERY]", help="Requests to refresh in the background.")
+    srv.add_argument("--poll-interval", type=float, help="Seconds between background refreshes. Defaults to --ttl.")
+    srv.add_argument("--max-entries", type=int, default=1024, help="Maximum cached responses.")
+    _add_credentials(srv)
+
+    return parser
+
+
+def _add_credentials(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--client-id", default=os.environ.get("BYMADATA_CLIENT_ID"),
+                        help="Client ID. Defaults to the BYMADATA_CLIENT_ID environment variable.")
+    parser.add_argument("--client-secret", default=os.environ.get("BYMADATA_CLIENT_SECRET"),
+                        help="Client secret key. Defaults to the BYMADATA_CLIENT_SECRET environment variable.")
+
+
+def _export_command(args: argparse.Namespace) -> int:
+    grid = _parse_grid(args.grid)
+
+    if args.workers < 1:
+        raise ValueError("Invalid number of workers. Must be a positive integer.")
+
+    client = BymaDataAPI(args.client_id, args.client_secret, args.endpoint)
+
+    paths = list(dict.fromkeys(args.paths))
+    per_path = args.format != "jsonl" and len(paths) > 1
+
+    if args.output == "-" and (args.format == "parquet" or per_path):
+        raise ValueError(f"{args.format} export of {'several paths' if per_path else 'parquet'} requires an output file.")
+
+    def open_writer(output: str) -> Any:
+        if args.format == "parquet":
+            return _ParquetWriter(output)
+        if output == "-":
+            out = sys.stdout
+        else:
+            out = open(output, "w", newline="", encoding="utf-8")
+        writer_class = _CSVWriter if args.format == "csv" else _JSONLinesWriter
+        return writer_class(out, owned=out is not sys.stdout)
+
+    if per_path:
+        root, ext = os.path.splitext(args.output)
+        writer = _PerPathWriter(lambda path: open_writer(f"{root}.{path}{ext}"))
+    else:
+        writer = open_writer(args.output)
+
+    try:
+        rows, failures = export(client, paths, grid, writer, workers=args.workers)
+    finally:
+        writer.close()
+
+    print(f"Exported {rows} rows ({failures} failed requests).", file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+def _serve_command(args: argparse.Namespace) -> int:
+    client = BymaDataAPI(args.client_id, args.client_secret, args.endpoint)
+    gateway = BymaDataGateway(
+        client, ttl=args.ttl, poll=args.poll, poll_interval=args.poll_interval, max_entries=args.max_entries
+    )
+
+    print(f"Serving {args.endpoint} on http://{args.host}:{args.port}/", file=sys.stderr)
+    gateway.serve_forever(args.host, args.port)
+
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the `bymadata` command.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    commands = {"export": _export_command, "serve": _serve_command}
+
+    if args.command not in commands:
+        parser.print_help()
+        return 2
+
+    try:
+        return commands[args.command](args)
+    except (BymaDataAPIError, ValueError, ImportError, OSError) as e:
+        print(f"bymadata: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
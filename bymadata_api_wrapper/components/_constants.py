@@ -4,3 +4,33 @@ API_BASE_URL = "https://api-mgr.byma.com.ar/"
 CONTENT_TYPE = "application/x-www-form-urlencoded"
 
 ENDPOINTS = ["snapshot", "delay20", "eod"]
+
+# Default field names of an intraday operation record
+INTRADAY_PRICE_FIELD = "price"
+INTRADAY_SIZE_FIELD = "size"
+INTRADAY_TIME_FIELD = "datetime"
+
+# Bar interval aliases, in seconds
+BAR_INTERVALS = {"1s": 1, "1m": 60, "5m": 300}
+
+# Default snapshot fields recorded by the time series buffers, as {column: field}
+SNAPSHOT_FIELDS = {"price": "price", "volume": "volume", "bid": "bid", "ask": "ask"}
+
+# BYMA trading session, local time (Buenos Aires, UTC-3 without daylight saving)
+TRADING_OPEN = "11:00"
+TRADING_CLOSE = "17:00"
+TRADING_UTC_OFFSET = -3
+
+# Month codes in futures tickers, e.g. DLR/ENE25 or DLR/JAN25
+MONTH_CODES = {
+    "ENE": 1, "JAN": 1, "FEB": 2, "MAR": 3, "ABR": 4, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AGO": 8, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DIC": 12, "DEC": 12,
+}
+
+DATA_PATHS = ["equity", "fixed_income", "futures", "options", "collateralized_repos", "trading_lots", "loans", "indices", "turnover", "intraday"]
+
+# Data methods of the API wrappers, served by the gateway and exported by the CLI
+WRAPPER_METHODS = [
+    "equity", "fixed_income", "futures", "options", "repos",
+    "trading_lots", "loans", "indices", "turnover", "intraday_ops",
+]
@@ -140,10 +140,13 @@ class OptionsCurrencyEnum(Enum):
 class OptionsParameters:
 
 	Required = {
-		"group" : OptionsGroupEnum,
 		"currency" : OptionsCurrencyEnum
 	}
 
+	NotRequired = {
+		"group" : OptionsGroupEnum
+	}
+
 
 """
 Collateralized Repos
@@ -190,8 +193,8 @@ Loans
 
 @unique
 class LoansGroupEnum(Enum):
-	VentaDescubierto : "PRESTAMOSV"
-	FallaLiquidacion : "PRESTAMOSL"
+	VentaDescubierto = "PRESTAMOSV"
+	FallaLiquidacion = "PRESTAMOSL"
 
 
 @unique
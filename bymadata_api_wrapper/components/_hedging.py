@@ -0,0 +1,195 @@
+"""
+    bymadata_api_wrapper._hedging
+
+    Request hedging: when a request has not answered by a latency percentile of
+    its path, a duplicate is sent and the first response is used.
+"""
+import time
+import threading
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class LatencyTracker(object):
+    """
+    Keeps the most recent request latencies per key.
+
+    Args:
+        window (int): Number of latencies kept per key.
+        min_samples (int): Samples required before a percentile is reported.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._window = window
+        self._min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        """
+        Records a latency.
+
+        Args:
+            key (str): Request key, e.g. the URL.
+            seconds (float): Request latency.
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """
+        Returns a latency percentile.
+
+        Args:
+            key (str): Request key.
+            q (float): Percentile, between 0 and 100.
+
+        Returns:
+            Optional[float]: Latency in seconds, or None if there are not enough samples.
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < self._min_samples:
+                return None
+            ordered = sorted(samples)
+
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100.0))]
+
+
+class Hedger(object):
+    """
+    Runs requests with hedging.
+
+    A request runs on a worker thread. If it has not completed by the `percentile`
+    latency of its key, and the hedge budget allows it, a duplicate is sent and the
+    first successful result is returned. The other request is cancelled if it has
+    not started; otherwise its response is closed as soon as it arrives.
+
+    Once closed, calls still in progress finish without a hedge and new calls run
+    unhedged on the calling thread.
+
+    Args:
+        percentile (float): Latency percentile that triggers a hedge.
+        budget (float): Maximum hedges as a fraction of requests, e.g. 0.05 for 5% extra load.
+        min_samples (int): Latency samples per key required before hedging.
+        window (int): Latency samples kept per key.
+        max_workers (int): Worker threads for requests.
+
+    Raises:
+        ValueError: If the percentile or budget is out of range.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 8
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("Invalid percentile. Must be between 0 and 100.")
+        if budget < 0:
+            raise ValueError("Invalid budget. Must be a non-negative fraction of requests.")
+
+        self.percentile = percentile
+        self.budget = budget
+
+        self._latencies = LatencyTracker(window=window, min_samples=min_samples)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _timed(self, key: str, fn: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        result = fn()
+        self._latencies.record(key, time.monotonic() - start)
+        return result
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    @staticmethod
+    def _discard(future: Future) -> None:
+        def close(f: Future) -> None:
+            if not f.cancelled() and f.exception() is None and hasattr(f.result(), "close"):
+                f.result().close()
+
+        if not future.cancel():
+            future.add_done_callback(close)
+
+    def call(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Calls `fn`, hedging it if it is slower than the tracked percentile for `key`.
+
+        Args:
+            key (str): Request key latencies are tracked by, e.g. the URL.
+            fn (Callable[[], Any]): Function performing the request.
+
+        Returns:
+            Any: Result of the first successful call.
+
+        Raises:
+            Exception: The primary call's exception if every call failed.
+        """
+        with self._lock:
+            self.requests += 1
+
+        threshold = self._latencies.percentile(key, self.percentile)
+        try:
+            primary = self._pool.submit(self._timed, key, fn)
+        except RuntimeError:
+            # Closed, e.g. replaced while this call was starting
+            return fn()
+
+        if threshold is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._take_budget():
+            return primary.result()
+
+        try:
+            hedge = self._pool.submit(self._timed, key, fn)
+        except RuntimeError:
+            return primary.result()
+        pending = {primary, hedge}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        self._discard(other)
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+
+        return primary.result()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns request and hedge counters.
+
+        Returns:
+            Dict[str, int]: Requests, hedges sent and hedges that answered first.
+        """
+        with self._lock:
+            return {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+    def close(self) -> None:
+        """Shuts down the worker threads without waiting for outstanding requests."""
+        self._pool.shutdown(wait=False)
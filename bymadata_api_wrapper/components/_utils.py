@@ -1,7 +1,10 @@
+import re
 import time
 import json
 import requests
 
+from datetime import datetime, timedelta, timezone
+
 from typing import Any, Dict, Callable, Optional, List
 from functools import wraps
 from inspect import signature
@@ -11,6 +14,8 @@ from .BymaDataAPIError import (
     UnexpectedResponseError
 )
 
+from ._constants import BAR_INTERVALS, TRADING_UTC_OFFSET
+
 from ._enums import (
     EquityParameters,
     FixedIncomeParameters,
@@ -23,6 +28,17 @@ from ._enums import (
 
 listring = lambda x: ", ".join(x)
 
+# BYMA local time; naive API times are in this zone
+BYMA_TZ = timezone(timedelta(hours=TRADING_UTC_OFFSET))
+
+# Fractional seconds, normalized to the 6 digits datetime supports
+_FRACTION_RE = re.compile(r"\.(\d+)")
+
+_TIME_FORMATS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+)
+
 def ensure_token(func: Callable) -> Callable:
     """
     Decorator to ensure that the API token is valid and refreshed if necessary.
@@ -156,3 +172,76 @@ def validate_params(service: str, validator: Callable = _validate_params, ignore
         return wrapper
 
     return decorator
+
+def to_timestamp(value: Any) -> float:
+    """
+    Converts an API time value into a POSIX timestamp.
+
+    Args:
+        value (Any): Epoch seconds or milliseconds, a datetime, or an ISO 8601 date/time
+            string. Values without a UTC offset are taken as BYMA time (UTC-3), and time-only
+            strings ("HH:MM:SS") as today in BYMA time.
+
+    Returns:
+        float: Seconds since the epoch.
+
+    Raises:
+        ValueError: If the value cannot be interpreted as a point in time.
+    """
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=BYMA_TZ)).timestamp()
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000.0 if value > 1e11 else float(value)
+
+    if isinstance(value, str):
+        text = value.strip()
+
+        try:
+            return to_timestamp(float(text))
+        except ValueError:
+            pass
+
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        text = _FRACTION_RE.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"), text, count=1)
+
+        try:
+            return to_timestamp(datetime.fromisoformat(text))
+        except ValueError:
+            pass
+
+        for fmt in _TIME_FORMATS:
+            try:
+                return to_timestamp(datetime.strptime(text, fmt))
+            except ValueError:
+                continue
+
+        for fmt in ("%H:%M:%S.%f", "%H:%M:%S"):
+            try:
+                t = datetime.strptime(text, fmt).time()
+                return datetime.combine(datetime.now(BYMA_TZ).date(), t, BYMA_TZ).timestamp()
+            except ValueError:
+                continue
+
+    raise ValueError(f"Invalid time value: {value!r}")
+
+def parse_interval(interval: Any) -> int:
+    """
+    Parses a bar interval into seconds.
+
+    Args:
+        interval (Any): Number of seconds or one of the aliases in BAR_INTERVALS.
+
+    Returns:
+        int: Interval length in seconds.
+
+    Raises:
+        ValueError: If the interval is unknown or not positive.
+    """
+    seconds = BAR_INTERVALS.get(interval, interval)
+
+    if not isinstance(seconds, int) or isinstance(seconds, bool) or seconds <= 0:
+        raise ValueError(f"Invalid interval: {interval!r}. Must be a positive number of seconds or one of: {listring(BAR_INTERVALS)}")
+
+    return seconds
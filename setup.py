@@ -9,6 +9,15 @@ setup(
     version="0.1.0",
     packages=find_packages(include=["bymadata_api_wrapper", "bymadata_api_wrapper.*"]),
     install_requires=requirements,
+    extras_require={
+        "parquet": ["pyarrow"],
+        "analytics": ["numpy"],
+    },
+    entry_points={
+        "console_scripts": [
+            "bymadata=bymadata_api_wrapper.cli:main",
+        ],
+    },
     author="Matias Gleser",
     author_email="mgleser@gdelplata.com",
     description="Unofficial BYMADATA API wrapper",
@@ -20,5 +29,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 )
@@ -0,0 +1,135 @@
+"""BymaDataGateway caching, HTTP semantics and error handling."""
+
+import gzip
+import json
+import time
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+import requests
+
+from bymadata_api_wrapper import BymaDataGateway
+from bymadata_api_wrapper.components._constants import WRAPPER_METHODS
+from bymadata_api_wrapper.components.BymaDataAPIError import BymaDataAPIError
+
+RECORDS = [{"security_id": "GGAL-0003-C-CT-ARS"}, {"security_id": "YPFD-0003-C-CT-ARS"}]
+
+
+class Client(object):
+    """Records upstream calls; `error` is raised instead of answering when set."""
+
+    def __init__(self):
+        self.calls = []
+        self.error = None
+        self.lock = threading.Lock()
+
+    def equity(self, ticker=None, settle_period="0003", currency="ARS", subgroup=None):
+        with self.lock:
+            self.calls.append({"settle_period": settle_period, "currency": currency})
+        time.sleep(0.05)
+        if self.error is not None:
+            raise self.error
+        return [dict(r) for r in RECORDS]
+
+    def indices(self):
+        raise RuntimeError("unexpected")
+
+
+class GatewayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.gateway = BymaDataGateway(self.client, ttl=0.5, max_entries=3)
+        self.gateway.start(port=0)
+        self.url = "http://%s:%d/" % self.gateway.address
+
+    def tearDown(self):
+        self.gateway.stop()
+
+    def get(self, target, headers=None):
+        request = urllib.request.Request(self.url + target, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request) as r:
+                return r.status, dict(r.headers), r.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+    def test_index_lists_wrapper_methods(self):
+        status, _, body = self.get("")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["paths"], WRAPPER_METHODS)
+
+    def test_equivalent_requests_share_one_upstream_call(self):
+        targets = ["equity", "equity?currency=ARS", "equity?settle_period=0003&ticker=GGAL", "equity?ticker=YPFD"]
+        threads = [threading.Thread(target=self.get, args=(t,)) for t in targets * 3]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.client.calls), 1)
+
+        status, _, body = self.get("equity?ticker=GGAL")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["result"], RECORDS[:1])
+
+    def test_etag_gzip_and_max_age(self):
+        status, headers, body = self.get("equity")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Cache-Control"], "max-age=1")
+
+        status, _, _ = self.get("equity", {"If-None-Match": headers["ETag"]})
+        self.assertEqual(status, 304)
+
+        status, headers, gzipped = self.get("equity", {"Accept-Encoding": "gzip"})
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(gzipped), body)
+
+    def test_stale_response_on_upstream_errors(self):
+        self.get("equity")
+        time.sleep(0.6)
+
+        for error in (requests.ConnectionError("down"), BymaDataAPIError("down")):
+            self.client.error = error
+            status, _, body = self.get("equity?ticker=YPFD")
+            self.assertEqual(status, 200)
+            self.assertEqual(json.loads(body)["result"], RECORDS[1:])
+
+    def test_errors_without_cache(self):
+        self.client.error = requests.ConnectionError("down")
+        self.assertEqual(self.get("equity?currency=USD")[0], 502)
+
+        self.client.error = KeyError("result")
+        self.assertEqual(self.get("equity?currency=EXT")[0], 502)
+
+        self.assertEqual(self.get("indices")[0], 502)
+        self.assertEqual(self.get("equity?bogus=1")[0], 400)
+        self.assertEqual(self.get("nope")[0], 404)
+
+    def test_cache_is_bounded(self):
+        for currency in ("ARS", "USD", "EXT", "ARS2", "USD2"):
+            self.get("equity?currency=" + currency)
+        self.assertEqual(len(self.gateway._cache), 3)
+
+    def test_poll_survives_errors(self):
+        calls = []
+
+        class Failing(object):
+            def indices(self):
+                calls.append(1)
+                raise KeyError("result")
+
+        gateway = BymaDataGateway(Failing(), ttl=0.05, poll=["indices"])
+        gateway.start(port=0)
+        time.sleep(0.3)
+        alive = all(t.is_alive() for t in gateway._threads)
+        gateway.stop()
+
+        self.assertTrue(alive)
+        self.assertGreater(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""Request hedging, against a Hedger directly and through a client talking to a local stub server."""
+
+import json
+import time
+import threading
+import unittest
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from bymadata_api_wrapper import SnapshotAPI
+from bymadata_api_wrapper.components._hedging import Hedger
+
+FAST = 0.005
+SLOW = 0.3
+
+
+class Response(object):
+    """Stands in for a requests.Response; records whether it was closed."""
+
+    def __init__(self, n):
+        self.n = n
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Upstream(object):
+    """Callable returning a Response, taking `delay` seconds for the call numbers in `slow`."""
+
+    def __init__(self, slow=(), delay=SLOW):
+        self.slow = set(slow)
+        self.delay = delay
+        self.calls = 0
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+        time.sleep(self.delay if n in self.slow else FAST)
+        response = Response(n)
+        with self._lock:
+            self.responses.append(response)
+        return response
+
+
+class HedgerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hedger = Hedger(percentile=50, budget=1.0, min_samples=5, max_workers=4)
+
+    def tearDown(self):
+        self.hedger.close()
+
+    def test_no_hedge_before_min_samples(self):
+        upstream = Upstream(slow={4})
+        for _ in range(5):
+            self.hedger.call("path", upstream)
+
+        # The fifth call was slow but only four latencies were known when it started
+        self.assertEqual(self.hedger.hedges, 0)
+        self.assertEqual(upstream.calls, 5)
+
+    def test_hedges_slow_call_after_min_samples(self):
+        upstream = Upstream(slow={5})
+        for _ in range(5):
+            self.hedger.call("path", upstream)
+
+        start = time.monotonic()
+        result = self.hedger.call("path", upstream)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(self.hedger.hedges, 1)
+        self.assertEqual(self.hedger.hedge_wins, 1)
+        self.assertEqual(result.n, 6)
+        self.assertLess(elapsed, SLOW)
+
+    def test_losing_response_is_closed(self):
+        upstream = Upstream(slow={5})
+        for _ in range(5):
+            self.hedger.call("path", upstream)
+
+        winner = self.hedger.call("path", upstream)
+        time.sleep(SLOW + 0.1)
+
+        loser = next(r for r in upstream.responses if r.n == 5)
+        self.assertTrue(loser.closed)
+        self.assertFalse(winner.closed)
+
+    def test_hedges_stay_within_budget(self):
+        hedger = Hedger(percentile=50, budget=0.1, min_samples=5, max_workers=4)
+        self.addCleanup(hedger.close)
+
+        upstream = Upstream(slow=range(5, 40), delay=0.05)
+        for _ in range(40):
+            hedger.call("path", upstream)
+
+        self.assertGreater(hedger.hedges, 0)
+        self.assertLessEqual(hedger.hedges, hedger.budget * hedger.requests)
+
+    def test_closed_hedger_runs_calls_unhedged(self):
+        upstream = Upstream()
+        self.hedger.close()
+        self.assertEqual(self.hedger.call("path", upstream).n, 0)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Token endpoint on POST; on GET a one-record snapshot, every 10th request slow."""
+
+    requests = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send({"access_token": "token", "token_type": "Bearer", "expires_in": 3600, "scope": ["snapshot"]})
+
+    def do_GET(self):
+        with StubHandler.lock:
+            n = StubHandler.requests
+            StubHandler.requests += 1
+        time.sleep(SLOW if n % 10 == 9 else FAST)
+        self._send({"result": [{"security_id": "GGAL-0003-C-CT-ARS"}]})
+
+
+class ClientHedgingTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def client(self):
+        StubHandler.requests = 0
+        return SnapshotAPI("id", "secret", auth_url=self.url + "token", base_url=self.url)
+
+    @staticmethod
+    def slow_calls(client, n):
+        slow = 0
+        for _ in range(n):
+            start = time.monotonic()
+            client.indices()
+            slow += time.monotonic() - start > SLOW / 2
+        return slow
+
+    def test_hedging_cuts_slow_calls(self):
+        plain = self.slow_calls(self.client(), 60)
+
+        client = self.client()
+        client.enable_hedging(percentile=90, budget=0.5, min_samples=10)
+        hedged = self.slow_calls(client, 60)
+        stats = client.hedging_stats()
+        client.disable_hedging()
+
+        self.assertGreaterEqual(plain, 6)
+        # The slow request before min_samples latencies were known is not hedged; allow
+        # one more whose hedge lost the budget to scheduling jitter on a loaded machine
+        self.assertLessEqual(hedged, 2)
+        self.assertGreater(stats["hedges"], 0)
+        self.assertLessEqual(stats["hedges"], 0.5 * stats["requests"])
+
+    def test_swapping_hedgers_mid_flight(self):
+        client = self.client()
+        client.enable_hedging(percentile=80, budget=0.2, min_samples=10)
+        errors = []
+
+        def worker():
+            try:
+                self.slow_calls(client, 30)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(20):
+            if i % 5 == 4:
+                client.disable_hedging()
+            else:
+                client.enable_hedging(percentile=80, budget=0.2, min_samples=10)
+            time.sleep(0.02)
+        for t in threads:
+            t.join()
+        client.disable_hedging()
+
+        self.assertEqual(errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
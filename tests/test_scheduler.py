@@ -0,0 +1,110 @@
+"""PollingScheduler budget, priorities and trading hours."""
+
+import time
+import threading
+import unittest
+
+from collections import Counter
+from datetime import datetime, date
+
+from bymadata_api_wrapper import PollingScheduler, TradingHours
+from bymadata_api_wrapper.components._utils import BYMA_TZ
+
+
+def byma_time(text):
+    return datetime.strptime(text, "%Y-%m-%d %H:%M").replace(tzinfo=BYMA_TZ).timestamp()
+
+
+class Client(object):
+    """Counts calls per method."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def _count(self, name):
+        with self.lock:
+            self.calls[name] += 1
+
+    def options(self):
+        self._count("options")
+
+    def indices(self):
+        self._count("indices")
+
+    def equity(self, group):
+        self._count("equity_" + group)
+
+
+class TradingHoursTest(unittest.TestCase):
+
+    def test_session(self):
+        hours = TradingHours(holidays=[date(2026, 10, 20)])
+
+        self.assertTrue(hours.is_open(byma_time("2026-10-19 12:00")))
+        self.assertFalse(hours.is_open(byma_time("2026-10-19 18:00")))
+        self.assertFalse(hours.is_open(byma_time("2026-10-17 12:00")))  # Saturday
+        self.assertFalse(hours.is_open(byma_time("2026-10-20 12:00")))  # Holiday
+
+        self.assertEqual(hours.next_open(byma_time("2026-10-19 18:00")), byma_time("2026-10-21 11:00"))
+        self.assertEqual(hours.next_open(byma_time("2026-10-17 12:00")), byma_time("2026-10-19 11:00"))
+
+
+class PollingSchedulerTest(unittest.TestCase):
+
+    def test_default_trading_hours_not_shared(self):
+        a = PollingScheduler(Client())
+        b = PollingScheduler(Client())
+
+        self.assertIsInstance(a._trading_hours, TradingHours)
+        self.assertIsNot(a._trading_hours, b._trading_hours)
+        self.assertIsNone(PollingScheduler(Client(), trading_hours=None)._trading_hours)
+
+    def test_burst_validation(self):
+        scheduler = PollingScheduler(Client(), rate=0.5, trading_hours=None)
+
+        self.assertEqual(scheduler._burst, 1)
+        with self.assertRaises(ValueError):
+            scheduler.add_job("options", 1, requests=2)
+        with self.assertRaises(ValueError):
+            PollingScheduler(Client(), rate=1, burst=0.5)
+
+    def test_rate_budget_and_priority(self):
+        client = Client()
+        scheduler = PollingScheduler(client, rate=20, burst=2, trading_hours=None)
+        scheduler.add_job("options", 0.05, priority=0, deadline=1)
+        scheduler.add_job("cedears", 0.05, method="equity", kwargs={"group": "CEDEARS"}, priority=1, deadline=1)
+        scheduler.add_job("indices", 0.05, priority=2, deadline=0.01)
+
+        scheduler.start()
+        time.sleep(1)
+        scheduler.stop()
+
+        calls = sum(client.calls.values())
+        # 20 requests per second plus the saved burst
+        self.assertLessEqual(calls, 20 + 2 + 1)
+        self.assertGreaterEqual(calls, 15)
+        self.assertGreater(client.calls["options"], client.calls["indices"])
+        # indices cannot wait for the budget within its deadline, so most of its runs are skipped
+        self.assertGreater(scheduler.stats()["indices"]["skipped"], 0)
+
+    def test_failing_job_keeps_running(self):
+        runs = []
+
+        def fail():
+            runs.append(1)
+            raise RuntimeError("down")
+
+        scheduler = PollingScheduler(Client(), rate=50, trading_hours=None)
+        scheduler.add_job("failing", 0.05, fn=fail)
+
+        scheduler.start()
+        time.sleep(0.3)
+        scheduler.stop()
+
+        self.assertGreater(len(runs), 1)
+        self.assertEqual(scheduler.stats()["failing"]["errors"], len(runs))
+
+
+if __name__ == "__main__":
+    unittest.main()